@@ -22,6 +22,7 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2017-02-20 : Release of the file
+# 1.1.0 - 2026-10-18 : Add streamed measurements upload status
 #
 from flask_restx import fields
 from api.restx import API
@@ -92,6 +93,28 @@ MEASUREMENT_POST = API.model("measurementPost", {
     )
 
 })
+EQUIPEMENT_MEASUREMENTS = API.inherit(
+    "equipementMeasurements",
+    MEASUREMENT_POST,
+    {
+        'equipement': fields.String(
+            required=True,
+            description='Equipement identifier'
+        ),
+        'time': fields.Integer(
+            required=False,
+            description='Measurements timestamp, used to find recording '
+                        'session (default= current_timestamp)'
+        )
+    }
+)
+MEASUREMENTS_BULK_POST = API.model("measurementsBulkPost", {
+    "equipements": fields.List(
+        fields.Nested(EQUIPEMENT_MEASUREMENTS),
+        required=True,
+        description="List of equipements measurements to store"
+    )
+})
 STEP_POST = API.model('stepPost', {
     'step': fields.String(required=True,
                           description='New step for current \
@@ -109,6 +132,13 @@ API_STATUS = API.model('APIStatus', {
                             decription='Current API status')
 })
 
+STREAM_STATUS = API.inherit('streamStatus', API_STATUS, {
+    'stored': fields.Integer(
+        required=True,
+        description='Number of measurements stored, in stream order'
+    )
+})
+
 RUNNING_SCENARIO = API.inherit('runningScenario', RECORDER_POST, {
     'environment': fields.String(required=True,
                                  description='Recorder identifier'),
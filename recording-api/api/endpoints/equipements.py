@@ -22,29 +22,52 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2019-04-10 : Release of the file
+# 1.1.0 - 2026-10-18 : Streamed measurements report stored count, use
+#                      topology model levels and per line default time
 #
+import json
 import logging
-import random
-
-import requests
+import time as systime
 
+import msgpack
 from flask import request
+from werkzeug.exceptions import ClientDisconnected
 from flask_restx import Resource
-from service.mqtt import MQTTService
 
 import settings
 from api.datamodel import API_STATUS, MEASUREMENT_POST
+from api.datamodel import MEASUREMENTS_BULK_POST, STREAM_STATUS, TOPOLOGY
 from api.restx import API as api
-from service.datamodel import APIStatusClass, RunningScenarioClass
+from service.datamodel import APIStatusClass, StreamStatusClass
 from service.exception import RecordingException
-from service.recorder import RecorderService
-from service.mqtt import MQTTService
+from service.lineprotocol import to_bytes
+from service.measurements import MeasurementService, UniqueTimestamps
 
 NS = api.namespace(
     'equipments',
     description='Equipements monitoring operations'
 )
 
+STREAM_PARSER = api.parser()
+STREAM_PARSER.add_argument(
+    'environment', type=str, required=True,
+    help='Recorder environment identifier',
+    location='args'
+)
+STREAM_PARSER.add_argument(
+    'time', type=int,
+    help='POSIX Timestamp (in nanosec) used to find recording session',
+    default=None,
+    location='args'
+)
+for topology_level in TOPOLOGY:
+    STREAM_PARSER.add_argument(
+        topology_level, type=str,
+        help=F'Equipement topology: {topology_level}',
+        default=None,
+        location='args'
+    )
+
 
 @NS.route('/<string:equipement>/measurements')
 class EquipementMeasurements(Resource):
@@ -52,22 +75,9 @@ class EquipementMeasurements(Resource):
 
     log = logging.getLogger(__name__)
 
-
-    def __init__(self, api=None, *args, **kwargs):
-        super().__init__(api, *args, **kwargs)
-        self._mqtt_svc = MQTTService()
-
-    def _get_topology_as_tag(self, payload):
-
-        res = ""
-        if "topology" in payload:
-            for key in payload["topology"]:
-                value = payload['topology'][key].replace(' ', '\\ ')
-                res += F",{key}={value}"
-        return res
-
     @api.expect(MEASUREMENT_POST)
     @api.marshal_with(API_STATUS)
+    @api.response(503, "Measurements buffer is full (write-behind mode).")
     def post(self, equipement):  # pylint: disable=locally-disabled,no-self-use
         """
         Measurements receiver.
@@ -78,7 +88,7 @@ class EquipementMeasurements(Resource):
         """
 
         data = request.json
-        recorder_manager = RecorderService()
+        measurement_svc = MeasurementService()
 
         self.log.info(
             "POST measurements for equiment %s in environment %s",
@@ -86,101 +96,280 @@ class EquipementMeasurements(Resource):
             data.get("environment")
         )
 
-        time = data.get("time", None)
-        if settings.ALWAYS_RECORD:
-            recorder = RunningScenarioClass(
-                data.get("environment"),
-                "n/s",
-                "n/s"
-            )
-        else:
-            recorder = recorder_manager.load_session(
-                data.get("environment"),
-                time
-            )
-
+        recorder = measurement_svc.get_recorder(
+            data.get("environment"),
+            data.get("time", None)
+        )
 
         result = APIStatusClass("OK")
 
-        sm_influx_data = ""
-        pm_influx_data = ""
-        for measurement in data["measurements"]:
-            time = measurement.get("time", None)
-
-            if sm_influx_data != "":
-                sm_influx_data += "\n"
-
-            sm_influx_data += "SensorMeasurement,equipement="
-            sm_influx_data += equipement.replace(' ', '\\ ')
-            sm_influx_data += ",environment="
-            sm_influx_data += recorder.environment.replace(' ', '\\ ')
-            sm_influx_data += ",scenario="
-            sm_influx_data += recorder.scenario.replace(' ', '\\ ')
-            sm_influx_data += ",step="
-            sm_influx_data += recorder.step.replace(' ', '\\ ')
-            sm_influx_data += self._get_topology_as_tag(data)
-            sm_influx_data += ",sensor="
-            sm_influx_data += measurement["sensor"].replace(' ', '\\ ')
-            sm_influx_data += ",unit="
-            sm_influx_data += measurement["unit"].replace(' ', '\\ ')
-            sm_influx_data += " value="
-            sm_influx_data += str(measurement["value"])
-
-            if time and time > 10e+9:
-                #Introduce aleat of 0..9999 nano sec to avoid data mixup
-                sm_time = time + random.randint(0,9999)
-                
-                sm_influx_data = sm_influx_data + " " + str(sm_time)
-
-            self._mqtt_svc.publish(
-                recorder.environment,
-                equipement,
-                recorder.scenario,
-                recorder.step,
-                measurement["sensor"],
-                measurement["unit"],
-                measurement["value"],
-                time,
-                data["topology"] if "topology" in data else None
-            )
+        # Points may be buffered or spooled: ensure they are not
+        # timestamped by influxDB at (delayed) write time
+        received = systime.time_ns()
 
-        if settings.INFLUX["user"] is not None:
-            auth = (settings.INFLUX["user"], settings.INFLUX["pass"])
-        else:
-            auth = None
-
-        influx_url = settings.INFLUX["host"]+"/write?db="
-        influx_url += settings.INFLUX["db"]
-        response = requests.post(
-            influx_url,
-            data=sm_influx_data.encode("utf-8"),
-            auth=auth,
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded; " +
-                                "charset=UTF-8"
-            },
-            verify=False)
-        if response.status_code != 204:
-            log_msg = "Error while storing measurment: {}"
-            log_msg = log_msg.format(response.text)
-            api.abort(500, log_msg)
-
-            response = requests.post(
-                influx_url,
-                data=pm_influx_data.encode("utf-8"),
-                auth=auth,
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded; " +
-                                    "charset=UTF-8"
-                },
-                verify=False)
-            if response.status_code != 204:
-                log_msg = "Error while storing measurment: {}"
-                log_msg = log_msg.format(response.text)
-                api.abort(500, log_msg)
+        lines = measurement_svc.encode(equipement, recorder, data, received)
+
+        try:
+            measurement_svc.store(to_bytes(lines), len(lines))
+        except RecordingException as exc:
+            api.abort(exc.http_status, exc.message)
 
         self.log.info(
             "POST measurements done!"
         )
 
         return result
+
+
+@NS.route('/measurements')
+class BulkMeasurements(Resource):
+    """Multi-equipements measurements API."""
+
+    log = logging.getLogger(__name__)
+
+    @api.expect(MEASUREMENTS_BULK_POST)
+    @api.marshal_with(API_STATUS)
+    @api.response(503, "Measurements buffer is full (write-behind mode).")
+    def post(self):  # pylint: disable=locally-disabled,no-self-use
+        """
+        Multi-equipements measurements receiver.
+
+        Store new measurements for many equipements (and environments)
+        in a single influxDB write.
+        Recording sessions are resolved for each environment and item
+        time (lookups are cached): if ALWAYS_RECORD is not set,
+        measurements of items without running session are ignored.
+        """
+
+        data = request.json
+        measurement_svc = MeasurementService()
+
+        self.log.info(
+            "POST measurements for %d equiments",
+            len(data["equipements"])
+        )
+
+        received = systime.time_ns()
+        # Items of a same equipement share their series
+        timestamps = UniqueTimestamps()
+        recorders = {}
+        lines = []
+        for item in data["equipements"]:
+            key = (item.get("environment"), item.get("time", None))
+            if key not in recorders:
+                try:
+                    recorders[key] = measurement_svc.get_recorder(*key)
+                except RecordingException as exc:
+                    if exc.http_status != 404:
+                        api.abort(exc.http_status, exc.message)
+                    self.log.info(exc.message)
+                    recorders[key] = None
+            if recorders[key] is not None:
+                lines += measurement_svc.encode(
+                    item["equipement"],
+                    recorders[key],
+                    item,
+                    received,
+                    timestamps
+                )
+
+        try:
+            measurement_svc.store(to_bytes(lines), len(lines))
+        except RecordingException as exc:
+            api.abort(exc.http_status, exc.message)
+
+        self.log.info(
+            "POST measurements done!"
+        )
+
+        return APIStatusClass("OK")
+
+
+@NS.route('/<string:equipement>/measurements/stream')
+class EquipementMeasurementsStream(Resource):
+    """Streamed measurements API."""
+
+    log = logging.getLogger(__name__)
+
+    @api.doc(
+        parser=STREAM_PARSER,
+        body=None,
+        description="Request body is a stream of measurements "
+                    "(see measurement model) with one JSON object per "
+                    "line (application/x-ndjson). Measurements are "
+                    "stored in batches, in stream order: response gives "
+                    "the number of stored measurements, so that an "
+                    "interrupted upload can be resumed after them."
+    )
+    @api.marshal_with(STREAM_STATUS)
+    @api.response(503, "Measurements buffer is full (write-behind mode).")
+    def post(self, equipement):  # pylint: disable=locally-disabled,no-self-use
+        """
+        Streamed measurements receiver.
+
+        Store measurements for a particular equipement read from request
+        body as newline delimited JSON. Measurements are stored in
+        batches while body is read, so that upload size is not limited
+        by API memory. Measurements without time are timestamped when
+        their line is read.
+            :param equipement: Equipement identifier
+            :type equipement: string
+        """
+        args = STREAM_PARSER.parse_args(request)
+        measurement_svc = MeasurementService()
+
+        self.log.info(
+            "POST measurements stream for equiment %s in environment %s",
+            equipement,
+            args["environment"]
+        )
+
+        recorder = measurement_svc.get_recorder(
+            args["environment"],
+            args["time"]
+        )
+        payload = {
+            "topology": {
+                level: args[level]
+                for level in TOPOLOGY
+                if args[level]
+            },
+            "measurements": []
+        }
+        batch_points = settings.STREAM["batch_points"]
+        nb_points = 0
+        nb_errors = 0
+        try:
+            for raw_line in request.stream:
+                if not raw_line.strip():
+                    continue
+                try:
+                    measurement = json.loads(raw_line)
+                    measurement = {
+                        "sensor": measurement["sensor"],
+                        "unit": measurement["unit"],
+                        "value": float(measurement["value"]),
+                        # Points read at once must not overwrite each other
+                        "time": measurement.get("time", None) or
+                                systime.time_ns()
+                    }
+                except (ValueError, TypeError, KeyError):
+                    nb_errors += 1
+                    continue
+                payload["measurements"].append(measurement)
+
+                if len(payload["measurements"]) >= batch_points:
+                    nb_points += self._store(
+                        measurement_svc, equipement, recorder, payload
+                    )
+            nb_points += self._store(
+                measurement_svc, equipement, recorder, payload
+            )
+        except RecordingException as exc:
+            api.abort(
+                exc.http_status,
+                F"{exc.message} ({nb_points} measurements stored)",
+                stored=nb_points
+            )
+        except ClientDisconnected:
+            self.log.warning(
+                "Measurements stream for %s interrupted "
+                "(%d measurements stored)",
+                equipement,
+                nb_points
+            )
+            raise
+
+        if nb_errors:
+            self.log.warning(
+                "%d invalid measurements ignored in stream for %s",
+                nb_errors,
+                equipement
+            )
+        self.log.info(
+            "POST measurements stream done (%d measurements)!",
+            nb_points
+        )
+
+        return StreamStatusClass("OK", nb_points)
+
+    @staticmethod
+    def _store(measurement_svc, equipement, recorder, payload):
+        """
+        Store pending measurements, return number of stored points.
+
+        Timestamps are made unique per batch: measurements without time
+        already have distinct (arrival) timestamps, and the registry of
+        the whole stream would grow with upload size.
+        """
+        lines = measurement_svc.encode(
+            equipement, recorder, payload, systime.time_ns()
+        )
+        measurement_svc.store(to_bytes(lines), len(lines))
+        payload["measurements"] = []
+        return len(lines)
+
+
+@NS.route('/<string:equipement>/measurements/packed')
+class EquipementMeasurementsPacked(Resource):
+    """Columnar binary measurements API."""
+
+    log = logging.getLogger(__name__)
+
+    @api.doc(
+        body=None,
+        description="Request body is a MessagePack (application/msgpack) "
+                    "map with keys: environment, time (optional), "
+                    "topology (optional), sensors (list of [sensor, unit]), "
+                    "index (sensors index of each measurement), values "
+                    "and times (optional) of each measurement."
+    )
+    @api.marshal_with(API_STATUS)
+    @api.response(400, "Invalid payload.")
+    @api.response(503, "Measurements buffer is full (write-behind mode).")
+    def post(self, equipement):  # pylint: disable=locally-disabled,no-self-use
+        """
+        Columnar measurements receiver.
+
+        Store new measurements for a particular equipement sent as
+        sensors dictionary and parallel values and times arrays
+            :param equipement: Equipement identifier
+            :type equipement: string
+        """
+        try:
+            data = msgpack.unpackb(request.get_data(), raw=False)
+            if not isinstance(data, dict) or "environment" not in data:
+                raise ValueError("environment is required")
+            for key in ("sensors", "index", "values"):
+                if not isinstance(data.get(key), list):
+                    raise ValueError(F"{key} should be a list")
+        except (ValueError, msgpack.UnpackException) as exc:
+            api.abort(400, F"Invalid packed measurements: {exc}")
+
+        measurement_svc = MeasurementService()
+
+        self.log.info(
+            "POST packed measurements for equiment %s in environment %s",
+            equipement,
+            data["environment"]
+        )
+
+        recorder = measurement_svc.get_recorder(
+            data["environment"],
+            data.get("time", None)
+        )
+        received = systime.time_ns()
+
+        try:
+            lines = measurement_svc.encode_columns(
+                equipement, recorder, data, received
+            )
+            measurement_svc.store(to_bytes(lines), len(lines))
+        except RecordingException as exc:
+            api.abort(exc.http_status, exc.message)
+
+        self.log.info(
+            "POST packed measurements done!"
+        )
+
+        return APIStatusClass("OK")
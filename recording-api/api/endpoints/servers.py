@@ -24,7 +24,6 @@
 # 1.0.0 - 2017-02-20 : Release of the file
 #
 import logging
-import requests
 
 from flask import request
 from flask_restx import Resource
@@ -34,6 +33,8 @@ from api.datamodel import POWER_MEASUREMENT, POWER_POST
 from api.restx import API as api
 from service.datamodel import PowerMeasurementClass, RunningScenarioClass
 from service.exception import RecordingException
+from service.influx import InfluxService
+from service.lineprotocol import PointEncoder
 from service.recorder import RecorderService
 
 
@@ -96,54 +97,37 @@ class ServerConsumption(Resource):
             recorder.step
         )
 
-        influx_data = "PowerMeasurement,hardware="
-        influx_data += server.replace(' ', '\\ ')
-        influx_data += ",environment="
-        influx_data += result.environment.replace(' ', '\\ ')
-        influx_data += ",scenario="
-        influx_data += result.scenario.replace(' ', '\\ ')
-        influx_data += ",step="
-        influx_data += result.step.replace(' ', '\\ ')
-        influx_data += " power="
-        influx_data += str(data.get("power"))
-        if time is not None:
-            influx_data = influx_data + " " + str(time)
-
-        if settings.INFLUX["user"] is not None:
-            auth = (settings.INFLUX["user"], settings.INFLUX["pass"])
-        else:
-            auth = None
-
-        influx_url = settings.INFLUX["host"]+"/write?db="
-        influx_url += settings.INFLUX["db"]
-        response = requests.post(
-            influx_url,
-            data=influx_data,
-            auth=auth,
-            verify=False)
+        influx_data = PointEncoder("PowerMeasurement").encode(
+            (
+                ("hardware", server),
+                ("environment", result.environment),
+                ("scenario", result.scenario),
+                ("step", result.step)
+            ),
+            (("power", data.get("power")),),
+            time
+        )
+
+        influx_svc = InfluxService()
+        response = influx_svc.write(influx_data)
         if response.status_code != 204:
             log_msg = "Error while storing measurment: {}"
             log_msg = log_msg.format(response.text)
             api.abort(500, log_msg)
 
-        influx_data = "SensorMeasurement,equipement="
-        influx_data += server.replace(' ', '\\ ')
-        influx_data += ",environment="
-        influx_data += recorder.environment.replace(' ', '\\ ')
-        influx_data += ",scenario="
-        influx_data += recorder.scenario.replace(' ', '\\ ')
-        influx_data += ",step="
-        influx_data += recorder.step.replace(' ', '\\ ')
-        influx_data += ",sensor=power"
-        influx_data += ",unit=W"
-        influx_data += " value="
-        influx_data += str(data["power"])
-
-        response = requests.post(
-            influx_url,
-            data=influx_data,
-            auth=auth,
-            verify=False)
+        influx_data = PointEncoder("SensorMeasurement").encode(
+            (
+                ("equipement", server),
+                ("environment", recorder.environment),
+                ("scenario", recorder.scenario),
+                ("step", recorder.step),
+                ("sensor", "power"),
+                ("unit", "W")
+            ),
+            (("value", data["power"]),)
+        )
+
+        response = influx_svc.write(influx_data)
         if response.status_code != 204:
             log_msg = "Error while storing measurment: {}"
             log_msg = log_msg.format(response.text)
@@ -22,7 +22,11 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2017-02-20 : Release of the file
+# 1.1.0 - 2026-10-18 : Limit decompressed request bodies size, reject
+#                      corrupted gzip bodies
 #
+import gzip
+import io
 import logging.config
 import sys
 
@@ -30,6 +34,8 @@ import flask_restx.apidoc
 import requests
 import yaml
 from flask import Blueprint, Flask
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.wsgi import LimitedStream
 
 import settings
 from api.endpoints.monitoring import NS as monitoring_namespace
@@ -37,6 +43,7 @@ from api.endpoints.recorder import NS as recorder_namespace
 #from api.endpoints.servers import NS as servers_namespace
 from api.endpoints.equipements import NS as equipements_namespace
 from api.restx import API as api
+from service.spool import get_spool
 
 APP = Flask(__name__)
 
@@ -119,6 +126,70 @@ class ProxyFix():
         return self.app(environ, start_response)
 
 
+class GunzipStream(io.RawIOBase):
+
+    """Decompressed request body stream.
+
+    Decompression errors are reported as `400 Bad Request` and bodies
+    larger than `max_size` once decompressed as `413 Request Entity Too
+    Large`.
+
+    :param stream: the compressed body stream
+    :param max_size: max. number of decompressed bytes
+    """
+
+    def __init__(self, stream, max_size):
+        super().__init__()
+        self._gzip = gzip.GzipFile(fileobj=stream, mode='rb')
+        self._max_size = max_size
+        self._size = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            size = self._gzip.readinto(buffer)
+        except (OSError, EOFError) as exc:
+            raise BadRequest(F"Invalid gzip body: {exc}") from exc
+        self._size += size
+        if self._max_size is not None and self._size > self._max_size:
+            raise RequestEntityTooLarge()
+        return size
+
+
+class GunzipRequest():
+
+    """This middleware decompress request bodies sent with
+    `Content-Encoding: gzip`.
+
+    Body is decompressed while it is read, so that streamed requests
+    remain streamed. As decompressed length is unknown, `CONTENT_LENGTH`
+    is removed and `wsgi.input_terminated` is set. Decompressed bodies
+    are limited to `settings.MAX_CONTENT_LENGTH` bytes.
+
+    :param app: the WSGI application
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding == 'gzip':
+            stream = environ['wsgi.input']
+            content_length = environ.get('CONTENT_LENGTH')
+            if content_length:
+                stream = LimitedStream(stream, int(content_length))
+            environ['wsgi.input'] = io.BufferedReader(
+                GunzipStream(stream, settings.MAX_CONTENT_LENGTH)
+            )
+            environ['wsgi.input_terminated'] = True
+            environ.pop('CONTENT_LENGTH', None)
+            environ.pop('HTTP_CONTENT_ENCODING', None)
+        return self.app(environ, start_response)
+
+
 def configure_app(flask_app):
     """Load application configuration to flask.
 
@@ -146,6 +217,10 @@ def configure_app(flask_app):
         'APPLICATION_ROOT'
     ] = settings.API["context_root"]
 
+    flask_app.config[
+        'MAX_CONTENT_LENGTH'
+    ] = settings.MAX_CONTENT_LENGTH
+
 
 def initialize_app(flask_app):
     """Apply application configuration.
@@ -155,7 +230,7 @@ def initialize_app(flask_app):
         :type flask_app: Flask
     """
     configure_app(flask_app)
-    flask_app.wsgi_app = ProxyFix(flask_app.wsgi_app)
+    flask_app.wsgi_app = ProxyFix(GunzipRequest(flask_app.wsgi_app))
 
     blueprint = Blueprint(
         'api', __name__,
@@ -183,7 +258,7 @@ def after_request(response):
     )
     response.headers.add(
         'Access-Control-Allow-Headers',
-        'Content-Type,Authorization'
+        'Content-Type,Content-Encoding,Authorization'
     )
     response.headers.add(
         'Access-Control-Allow-Methods',
@@ -210,17 +285,39 @@ def load_config():
             config = yaml.safe_load(stream)
             settings.BIND = config["BIND"]
             settings.INFLUX = config["INFLUX"]
+            for key, value in settings.INFLUX_DEFAULTS.items():
+                if key not in settings.INFLUX:
+                    settings.INFLUX[key] = value
             settings.MQTT = config["MQTT"] if "MQTT" in config else None
             if settings.MQTT and "port" not in settings.MQTT:
                 settings.MQTT["port"] = 1883
             if settings.MQTT and "base_path" not in settings.MQTT:
                 settings.MQTT["base_path"] = ""
+            if settings.MQTT and "qos" not in settings.MQTT:
+                settings.MQTT["qos"] = 0
+            if settings.MQTT and "aggregate" not in settings.MQTT:
+                settings.MQTT["aggregate"] = False
+            if settings.MQTT and "queue_size" not in settings.MQTT:
+                settings.MQTT["queue_size"] = 10000
             if "ALWAYS_RECORD" in config:
                 settings.ALWAYS_RECORD = config["ALWAYS_RECORD"]
+            if "MAX_CONTENT_LENGTH" in config:
+                settings.MAX_CONTENT_LENGTH = config["MAX_CONTENT_LENGTH"]
+            if "WRITE_BEHIND" in config:
+                settings.WRITE_BEHIND.update(config["WRITE_BEHIND"])
+            if "SPOOL" in config:
+                settings.SPOOL.update(config["SPOOL"])
+            if "STREAM" in config:
+                settings.STREAM.update(config["STREAM"])
+            if "SESSION_CACHE" in config:
+                settings.SESSION_CACHE.update(config["SESSION_CACHE"])
         except yaml.YAMLError:
             LOG.exception("Error while loading config")
             sys.exit()
     initialize_app(APP)
+    if settings.SPOOL["enabled"]:
+        # Replay data spooled before restart
+        get_spool()
     LOG.info('>>>>> Starting server  <<<<<')
 
 
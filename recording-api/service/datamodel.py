@@ -78,3 +78,21 @@ class APIStatusClass(object):
             :type status: string
         """
         self.status = status
+
+
+# pylint: disable=locally-disabled,too-few-public-methods
+class StreamStatusClass(APIStatusClass):
+    """Streamed measurements upload status."""
+
+    def __init__(self, status, stored):
+        """
+        Constructor: create an instance of StreamStatusClass.
+
+            :param status: Current API status
+            :type status: string
+
+            :param stored: Number of measurements stored
+            :type stored: int
+        """
+        APIStatusClass.__init__(self, status)
+        self.stored = stored
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""InfluxDB HTTP API access."""
+# --------------------------------------------------------
+# Module Name : power recording API
+# Version : 1.0
+#
+# Copyright © 2022 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     InfluxDB HTTP API access through a pooled keep-alive session.
+
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import settings
+
+
+class InfluxService:
+    """InfluxDB HTTP API client sharing one connection pool per process."""
+
+    logger = logging.getLogger(__name__)
+
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        """
+        Get HTTP session for current process.
+
+        A new session is created after fork so that gunicorn workers
+        never share sockets.
+        """
+        pid = os.getpid()
+        if cls._session is None or cls._session_pid != pid:
+            with cls._session_lock:
+                if cls._session is None or cls._session_pid != pid:
+                    retries = Retry(
+                        total=settings.INFLUX["retries"],
+                        read=False,
+                        status=False,
+                        backoff_factor=0.1
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=settings.INFLUX["pool_size"],
+                        max_retries=retries
+                    )
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.verify = False
+                    if settings.INFLUX["user"] is not None:
+                        session.auth = (
+                            settings.INFLUX["user"],
+                            settings.INFLUX["pass"]
+                        )
+                    cls.logger.debug(
+                        "InfluxDB connection pool created for process %d",
+                        pid
+                    )
+                    cls._session = session
+                    cls._session_pid = pid
+        return cls._session
+
+    # pylint: disable=no-self-use
+    def write(self, data, retention_policy=None, timeout=None):
+        """
+        Write line protocol data to influxDB.
+
+            :param data: Line protocol data
+            :type data: string or bytes
+
+            :param retention_policy: Target retention policy (default DB one)
+            :type retention_policy: string
+
+            :param timeout: Request timeout in sec. (default from settings)
+            :type timeout: float
+
+            :return: HTTP response
+            :rtype: requests.Response
+        """
+        params = {"db": settings.INFLUX["db"]}
+        if retention_policy:
+            params["rp"] = retention_policy
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        return self._get_session().post(
+            settings.INFLUX["host"] + "/write",
+            params=params,
+            data=data,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded; " +
+                                "charset=UTF-8"
+            },
+            timeout=timeout or settings.INFLUX["timeout"]
+        )
+
+    # pylint: disable=no-self-use
+    def query(self, query, timeout=None, epoch=None):
+        """
+        Execute influxQL query.
+
+            :param query: Query to execute
+            :type query: string
+
+            :param timeout: Request timeout in sec. (default from settings)
+            :type timeout: float
+
+            :param epoch: Timestamps precision (ex. "ns"), RFC3339 strings
+                          if not set
+            :type epoch: string
+
+            :return: HTTP response
+            :rtype: requests.Response
+        """
+        params = {
+            "q": query,
+            "db": settings.INFLUX["db"]
+        }
+        if epoch is not None:
+            params["epoch"] = epoch
+        return self._get_session().get(
+            settings.INFLUX["host"] + "/query",
+            params=params,
+            timeout=timeout or settings.INFLUX["timeout"]
+        )
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""InfluxDB line protocol encoding."""
+# --------------------------------------------------------
+# Module Name : power recording API
+# Version : 1.0
+#
+# Copyright © 2022 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     InfluxDB line protocol encoding.
+#
+# History     :
+# 1.0.1 - 2026-10-18 : Strip newlines from names and tags, explicit
+#                      numbers formatting
+
+import functools
+
+# Line protocol has no escape sequence for line breaks: they are stripped
+_MEASUREMENT_ESCAPES = str.maketrans({
+    ",": "\\,",
+    " ": "\\ ",
+    "\n": None,
+    "\r": None
+})
+_TAG_ESCAPES = str.maketrans({
+    ",": "\\,",
+    "=": "\\=",
+    " ": "\\ ",
+    "\n": None,
+    "\r": None
+})
+_STRING_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"'
+})
+
+
+def escape_measurement(name):
+    """Escape measurement name."""
+    return str(name).translate(_MEASUREMENT_ESCAPES)
+
+
+@functools.lru_cache(maxsize=4096)
+def escape_tag(value):
+    """Escape tag key, tag value or field key."""
+    return str(value).translate(_TAG_ESCAPES)
+
+
+def format_field(value):
+    """
+    Format field value.
+
+    Booleans are written as line protocol booleans. Integers are written
+    without "i" suffix, so influxDB stores them as floats like other
+    numbers: this avoids field type conflicts between points sent as
+    integers or floats.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    return '"' + str(value).translate(_STRING_ESCAPES) + '"'
+
+
+def format_tags(tags):
+    """
+    Format tags set.
+
+    Tags with empty value (refused by influxDB) are ignored
+        :param tags: List of (key, value) tuples
+        :type tags: iterable
+    """
+    return "".join([
+        "," + escape_tag(key) + "=" + escape_tag(value)
+        for key, value in tags
+        if value is not None and value != ""
+    ])
+
+
+class PointEncoder:
+    """Encode points of a measurement sharing a common set of tags."""
+
+    def __init__(self, measurement, tags=()):
+        """
+        Create a PointEncoder instance.
+
+            :param measurement: Measurement name
+            :type measurement: string
+
+            :param tags: Tags shared by all points, list of (key, value)
+            :type tags: iterable
+        """
+        self._prefix = escape_measurement(measurement) + format_tags(tags)
+
+    def encode(self, tags=(), fields=(), timestamp=None):
+        """
+        Encode a point as line protocol.
+
+            :param tags: Point specific tags, list of (key, value)
+            :type tags: iterable
+
+            :param fields: Point fields, list of (key, value)
+            :type fields: iterable
+
+            :param timestamp: Point timestamp (in ns)
+            :type timestamp: int
+        """
+        line = [
+            self._prefix,
+            format_tags(tags),
+            " ",
+            ",".join([
+                escape_tag(key) + "=" + format_field(value)
+                for key, value in fields
+            ])
+        ]
+        if timestamp is not None:
+            line.append(" ")
+            line.append(str(int(timestamp)))
+        return "".join(line)
+
+
+def to_bytes(lines):
+    """Return line protocol payload from a list of encoded points."""
+    return "\n".join(lines).encode("utf-8")
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""Measurements storage."""
+# --------------------------------------------------------
+# Module Name : power recording API
+# Version : 1.0
+#
+# Copyright © 2022 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Measurements storage.
+
+import logging
+
+import requests
+
+import settings
+from service.datamodel import RunningScenarioClass
+from service.exception import RecordingException
+from service.influx import InfluxService
+from service.lineprotocol import PointEncoder
+from service.mqtt import MQTTService
+from service.recorder import RecorderService
+from service.spool import get_spool
+from service.writebehind import get_buffer
+
+
+class UniqueTimestamps:
+    """
+    Make measurements timestamps unique per series within a request.
+
+    Influx overwrites points having the same series and timestamp. A
+    timestamp already used by a series (equipement, sensor) in the
+    request is moved to the next free nanosecond. Timestamps only depend
+    on request content, so that a resent request overwrites points it
+    already stored instead of duplicating them.
+    """
+
+    def __init__(self):
+        """Create an empty timestamps registry."""
+        self._used = set()
+        self._next = {}
+
+    def get(self, series, time):
+        """
+        Get unique timestamp for a series.
+
+            :param series: Series identifier (equipement, sensor)
+            :type series: tuple
+
+            :param time: Measurement timestamp (in ns)
+            :type time: int
+        """
+        key = (series, time)
+        if key in self._used:
+            candidate = self._next.get(key, time + 1)
+            while (series, candidate) in self._used:
+                candidate += 1
+            self._next[key] = candidate + 1
+            time = candidate
+        self._used.add((series, time))
+        return time
+
+
+class MeasurementService:
+    """Measurements storage services."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self):
+        """Create a MeasurementService instance."""
+        self._mqtt_svc = MQTTService()
+
+    # pylint: disable=no-self-use
+    def get_recorder(self, env, time=None):
+        """
+        Get recording session to attach measurements to.
+
+            :param env: Environnement identifier
+            :type env: string
+
+            :param time: Measurements timestamp (in ns)
+            :type time: int
+
+            :raise RecordingException: (404) if no session is running
+                                       and ALWAYS_RECORD is not set
+        """
+        if settings.ALWAYS_RECORD:
+            return RunningScenarioClass(env, "n/s", "n/s")
+        return RecorderService().load_session(env, time)
+
+    @staticmethod
+    def _get_tags(equipement, recorder, topology):
+        """Get tags shared by all measurements of an equipement."""
+        tags = [
+            ("equipement", equipement),
+            ("environment", recorder.environment),
+            ("scenario", recorder.scenario),
+            ("step", recorder.step)
+        ]
+        if topology:
+            tags += list(topology.items())
+        return tags
+
+    def encode(self, equipement, recorder, payload, received,
+               timestamps=None):
+        """
+        Encode an equipement measurements as line protocol.
+
+        Measurements are also republished on MQTT (if configured)
+            :param equipement: Equipement identifier
+            :type equipement: string
+
+            :param recorder: Recording session
+            :type recorder: RunningScenarioClass
+
+            :param payload: Measurements payload (see MEASUREMENT_POST)
+            :type payload: dictionary
+
+            :param received: Default timestamp (in ns)
+            :type received: int
+
+            :param timestamps: Timestamps registry of the request (a new
+                               one is used if not set)
+            :type timestamps: UniqueTimestamps
+
+            :return: list of encoded points
+            :rtype: list
+        """
+        topology = payload.get("topology")
+        encoder = PointEncoder(
+            "SensorMeasurement",
+            self._get_tags(equipement, recorder, topology)
+        )
+
+        if timestamps is None:
+            timestamps = UniqueTimestamps()
+        lines = []
+        published = []
+        for measurement in payload["measurements"]:
+            time = measurement.get("time", None)
+
+            if time and time > 10e+9:
+                sm_time = time
+            else:
+                sm_time = received
+            sm_time = timestamps.get(
+                (equipement, measurement["sensor"]),
+                sm_time
+            )
+            lines.append(encoder.encode(
+                (
+                    ("sensor", measurement["sensor"]),
+                    ("unit", measurement["unit"])
+                ),
+                (("value", measurement["value"]),),
+                sm_time
+            ))
+            if settings.MQTT:
+                published.append((
+                    measurement["sensor"],
+                    measurement["unit"],
+                    measurement["value"],
+                    time
+                ))
+
+        self._mqtt_svc.publish_measurements(
+            recorder.environment,
+            equipement,
+            recorder.scenario,
+            recorder.step,
+            published,
+            topology
+        )
+        return lines
+
+    def encode_columns(self, equipement, recorder, payload, received,
+                       timestamps=None):
+        """
+        Encode an equipement columnar measurements as line protocol.
+
+        Measurements are also republished on MQTT (if configured)
+            :param equipement: Equipement identifier
+            :type equipement: string
+
+            :param recorder: Recording session
+            :type recorder: RunningScenarioClass
+
+            :param payload: Columnar measurements payload
+            :type payload: dictionary
+            {
+                "topology": optional, equipement topology,
+                "sensors": list of [sensor, unit],
+                "index": index in sensors of each measurement,
+                "values": value of each measurement,
+                "times": optional, timestamp (in ns) of each measurement
+            }
+
+            :param received: Default timestamp (in ns)
+            :type received: int
+
+            :param timestamps: Timestamps registry of the request (a new
+                               one is used if not set)
+            :type timestamps: UniqueTimestamps
+
+            :return: list of encoded points
+            :rtype: list
+
+            :raise RecordingException: (400) on inconsistent payload
+        """
+        topology = payload.get("topology")
+        sensors = payload["sensors"]
+        index = payload["index"]
+        values = payload["values"]
+        times = payload.get("times") or [None] * len(values)
+        if not isinstance(times, list) or \
+                not len(index) == len(values) == len(times):
+            raise RecordingException(
+                "index, values and times should have the same length",
+                400
+            )
+        for sensor in sensors:
+            if not isinstance(sensor, list) or len(sensor) != 2:
+                raise RecordingException(
+                    F"Invalid sensor {sensor}, expected [sensor, unit]",
+                    400
+                )
+        for sensor_idx in index:
+            if isinstance(sensor_idx, bool) or \
+                    not isinstance(sensor_idx, int) or \
+                    not 0 <= sensor_idx < len(sensors):
+                raise RecordingException(
+                    F"Invalid sensor index {sensor_idx}",
+                    400
+                )
+        for value in values:
+            if isinstance(value, bool) or \
+                    not isinstance(value, (int, float)):
+                raise RecordingException(
+                    F"Invalid value {value!r}, expected a number",
+                    400
+                )
+        for time in times:
+            if time is not None and (
+                    isinstance(time, bool) or not isinstance(time, int)
+            ):
+                raise RecordingException(
+                    F"Invalid time {time!r}, expected a timestamp in ns",
+                    400
+                )
+
+        # Sensor and unit tags are shared too: one encoder per sensor
+        tags = self._get_tags(equipement, recorder, topology)
+        encoders = [
+            PointEncoder(
+                "SensorMeasurement",
+                tags + [("sensor", sensor), ("unit", unit)]
+            )
+            for sensor, unit in sensors
+        ]
+
+        if timestamps is None:
+            timestamps = UniqueTimestamps()
+        lines = []
+        published = []
+        for sensor_idx, value, time in zip(index, values, times):
+            if time and time > 10e+9:
+                sm_time = time
+            else:
+                sm_time = received
+            encoder = encoders[sensor_idx]
+            sm_time = timestamps.get(
+                (equipement, sensors[sensor_idx][0]),
+                sm_time
+            )
+            lines.append(encoder.encode((), (("value", value),), sm_time))
+            if settings.MQTT:
+                published.append((
+                    sensors[sensor_idx][0],
+                    sensors[sensor_idx][1],
+                    value,
+                    time
+                ))
+
+        self._mqtt_svc.publish_measurements(
+            recorder.environment,
+            equipement,
+            recorder.scenario,
+            recorder.step,
+            published,
+            topology
+        )
+        return lines
+
+    # pylint: disable=no-self-use
+    def store(self, data, nb_points):
+        """
+        Store measurements in influxDB.
+
+        When write-behind mode is enabled, data are buffered and written
+        later in batches, else they are written immediatly.
+        If spool is enabled, data influxDB can't store are spooled
+        instead of reporting an error.
+
+            :param data: Line protocol data
+            :type data: bytes
+
+            :param nb_points: Number of points in data
+            :type nb_points: int
+
+            :raise RecordingException: on storage error
+        """
+        if not data:
+            return
+
+        if settings.WRITE_BEHIND["enabled"]:
+            get_buffer().enqueue(data, nb_points)
+            return
+
+        try:
+            response = InfluxService().write(data)
+        except requests.exceptions.RequestException as exc:
+            if not settings.SPOOL["enabled"]:
+                raise
+            self.logger.error("influxDB unreachable: %s", exc)
+            response = None
+
+        if response is not None and response.status_code == 204:
+            return
+
+        if settings.SPOOL["enabled"] and (
+                response is None or response.status_code >= 500
+        ):
+            get_spool().append(data, nb_points)
+            return
+
+        log_msg = "Error while storing measurment: {}"
+        log_msg = log_msg.format(response.text)
+        raise RecordingException(log_msg, 500)
@@ -17,11 +17,9 @@
 
 import json
 import logging
-import urllib
-
-import requests
 
 from service.datamodel import APIStatusClass
+from service.influx import InfluxService
 import settings
 
 class MonitoringService:
@@ -33,17 +31,10 @@ class MonitoringService:
         """Try to connect influxDB."""
 
         result = APIStatusClass("OK")
-        if settings.INFLUX["user"] is not None:
-            auth = (settings.INFLUX["user"], settings.INFLUX["pass"])
-        else:
-            auth = None
 
         query = 'SHOW RETENTION POLICIES ON "{}"'
         query = query.format(settings.INFLUX["db"])
-        influx_url = settings.INFLUX["host"] + "/query?q="
-        influx_url += urllib.parse.quote(query)
-        influx_url += "&db=" + urllib.parse.quote(settings.INFLUX["db"])
-        response = requests.get(influx_url, auth=auth, timeout=1, verify=False)
+        response = InfluxService().query(query, timeout=1)
         if response.status_code != 200:
             error = json.loads(response.text)
             raise Exception("Unable to connect influxDB: " + error["error"])
@@ -18,16 +18,183 @@
 import datetime
 import json
 import logging
+import os
+import queue
+import socket
+import threading
 
 import paho.mqtt.client as mqtt
 
 import settings
 
+
 class MQTTService:
+    """
+    Republish measurements on MQTT.
+
+    All instances of a process share the same MQTT connection, with its
+    own network loop thread. Publications are queued and sent by a
+    background thread so that MQTT never slows down HTTP requests.
+    """
 
     _logger = logging.getLogger(__name__)
 
     _mqtt_client = None
+    _queue = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _create_client(cls):
+        """Create process MQTT client and start its network loop."""
+        client_id = F"energyrecorder-{socket.gethostname()}-{os.getpid()}"
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            client = mqtt.Client(
+                mqtt.CallbackAPIVersion.VERSION2,
+                client_id=client_id
+            )
+        else:
+            client = mqtt.Client(client_id=client_id)
+        if "user" in settings.MQTT and settings.MQTT["user"]:
+            client.username_pw_set(
+                settings.MQTT["user"],
+                settings.MQTT["pass"]
+            )
+        # Connection (and reconnections) are handled by network loop
+        client.connect_async(
+            settings.MQTT["host"],
+            settings.MQTT["port"],
+        )
+        client.loop_start()
+        return client
+
+    @classmethod
+    def _get_queue(cls):
+        """Get publications queue, start MQTT threads if needed."""
+        pid = os.getpid()
+        if cls._queue is None or cls._pid != pid:
+            with cls._lock:
+                if cls._queue is None or cls._pid != pid:
+                    cls._mqtt_client = cls._create_client()
+                    cls._queue = queue.Queue(settings.MQTT["queue_size"])
+                    cls._pid = pid
+                    threading.Thread(
+                        target=cls._run,
+                        args=(cls._mqtt_client, cls._queue),
+                        name="mqtt/publisher",
+                        daemon=True
+                    ).start()
+        return cls._queue
+
+    @classmethod
+    def _run(cls, client, jobs):
+        """Publisher thread main code."""
+        while True:
+            job = jobs.get()
+            try:
+                for topic, data in cls._get_messages(*job):
+                    client.publish(
+                        topic,
+                        json.dumps(data),
+                        qos=settings.MQTT["qos"]
+                    )
+            except Exception:  # pylint: disable=broad-except
+                cls._logger.exception("Error while publishing on MQTT")
+
+    @staticmethod
+    def _get_messages(
+            environment,
+            equipement,
+            scenario,
+            step,
+            measurements,
+            topology,
+            published
+    ):
+        """Build (topic, data) messages for an equipement measurements."""
+        base_path = settings.MQTT["base_path"]
+        if settings.MQTT["aggregate"]:
+            data = {
+                "environment": environment,
+                "equipement": equipement,
+                "scenario": scenario,
+                "step": step,
+                "measurements": [
+                    {
+                        "sensor": sensor,
+                        "unit": unit,
+                        "value": value,
+                        "timestamp": time if time else published
+                    }
+                    for sensor, unit, value, time in measurements
+                ]
+            }
+            if topology:
+                data["topology"] = topology
+            yield (F'{base_path}/{environment}/{equipement}', data)
+            return
+
+        for sensor, unit, value, time in measurements:
+            data = {
+                "environment": environment,
+                "equipement": equipement,
+                "scenario": scenario,
+                "step": step,
+                "sensor": sensor,
+                "unit": unit,
+                "value": value,
+                "timestamp": time if time else published
+            }
+            if topology:
+                data["topology"] = topology
+            yield (F'{base_path}/{environment}/{equipement}/{sensor}', data)
+
+    def publish_measurements(
+        self,
+        environment,
+        equipement,
+        scenario,
+        step,
+        measurements,
+        topology=None
+    ):
+        """Publish an equipement measurements to MQTT (asynchronously).
+
+        Measurements are published one per topic, or as a single message
+        if "aggregate" is set in MQTT settings.
+
+        :param environment: related environmenet
+        :type environment: str
+        :param equipement: related equipement
+        :type equipement: str
+        :param scenario: current running scenario
+        :type scenario: str
+        :param step: Current scenaio step
+        :type step: str
+        :param measurements: list of (sensor, unit, value, time) tuples
+        :type measurements: list
+        :param topology: DOC Topology
+        :type unit: disct
+        """
+        if not settings.MQTT or not measurements:
+            return
+        try:
+            self._get_queue().put_nowait((
+                environment,
+                equipement,
+                scenario,
+                step,
+                measurements,
+                topology,
+                int(datetime.datetime.now().timestamp())
+            ))
+        except queue.Full:
+            self._logger.warning(
+                "MQTT publication queue is full: %d measurements of %s "
+                "not published",
+                len(measurements),
+                equipement
+            )
 
     def publish(
         self,
@@ -41,7 +208,7 @@ class MQTTService:
         time,
         topology=None
     ):
-        """Publish a data to MQTT
+        """Publish a data to MQTT (asynchronously)
 
         :param environment: related environmenet
         :type environment: str
@@ -62,35 +229,11 @@ class MQTTService:
         :param topology: DOC Topology
         :type unit: disct
         """
-
-        if settings.MQTT:
-            if not self._mqtt_client:
-                self._mqtt_client = mqtt.Client(str(datetime.datetime.now().timestamp()))
-                if "user" in settings.MQTT and settings.MQTT["user"]:
-                    self._mqtt_client.username_pw_set(
-                        settings.MQTT["user"],
-                        settings.MQTT["pass"]
-                    )
-                self._mqtt_client.connect(
-                    settings.MQTT["host"],
-                    settings.MQTT["port"],
-                )
-            
-            data = {
-                "environment": environment,
-                "equipement": equipement,
-                "scenario": scenario,
-                "step": step,
-                "sensor": sensor,
-                "unit": unit,
-                "value": value,
-                "timestamp": time if time else int(datetime.datetime.now().timestamp())
-            }
-            if topology:
-                data["topology"] = topology
-            self._mqtt_client.publish(
-                F'{settings.MQTT["base_path"]}/{environment}/{equipement}/{sensor}',
-                json.dumps(
-                    data
-                )
-            )
+        self.publish_measurements(
+            environment,
+            equipement,
+            scenario,
+            step,
+            [(sensor, unit, value, time)],
+            topology
+        )
@@ -17,16 +17,137 @@
 
 import logging
 import json
-import urllib
-import requests
+import os
+import threading
+import time as systime
 
 import settings
 from service.datamodel import RunningScenarioClass
 from service.exception import RecordingException
+from service.influx import InfluxService
+from service.lineprotocol import PointEncoder
 
 RUNNING_SCENARIO_RP = "running_scenarios_rp"
 
 
+class SessionCache:
+    """
+    Short lived cache for recording sessions lookups.
+
+    A lookup result is valid between the session changes surrounding the
+    looked up timestamp: entries are keyed by environment and by these
+    boundaries, and shared by all threads of a worker process. Worker
+    processes are kept consistent through a generation file replaced at
+    each session change: when its identity changes, every cached entry is
+    dropped.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        # env: list of (expiration, start, end, value)
+        self._entries = {}
+        self._generation = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _matches(entry, time):
+        """Return True if an entry is valid for a timestamp (in ns)."""
+        _, start, end, _ = entry
+        if time is None:
+            # Current session: no change known after entry start
+            return end is None
+        return (start is None or start <= time) and \
+            (end is None or time < end)
+
+    @staticmethod
+    def _read_generation():
+        """Return current generation shared accross workers."""
+        try:
+            stat = os.stat(settings.SESSION_CACHE["generation_file"])
+            return (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _sync_generation(self):
+        """Drop entries if sessions changed in any worker (lock held)."""
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+            return False
+        return True
+
+    def get(self, env, time):
+        """
+        Get cached lookup result.
+
+        Return a (found, value) tuple where value is a (scenario, step)
+        tuple or None if no session was found at lookup time.
+        """
+        if settings.SESSION_CACHE["ttl"] <= 0:
+            return (False, None)
+        with self._lock:
+            if not self._sync_generation():
+                return (False, None)
+            now = systime.monotonic()
+            for entry in self._entries.get(env, []):
+                if entry[0] >= now and self._matches(entry, time):
+                    return (True, entry[3])
+            return (False, None)
+
+    def put(self, env, start, end, value):
+        """
+        Store lookup result if no session changed meanwhile.
+
+            :param env: Environnement identifier
+            :type env: string
+
+            :param start: Timestamp (in ns) of the session change before
+                          looked up time, None if there is none
+            :type start: int
+
+            :param end: Timestamp (in ns) of the session change after
+                        looked up time, None if there is none
+            :type end: int
+
+            :param value: (scenario, step) tuple or None if no session
+                          was found
+            :type value: tuple
+        """
+        if settings.SESSION_CACHE["ttl"] <= 0:
+            return
+        with self._lock:
+            if self._sync_generation():
+                now = systime.monotonic()
+                entries = [
+                    entry for entry in self._entries.get(env, [])
+                    if entry[0] >= now
+                ]
+                entries.append(
+                    (now + settings.SESSION_CACHE["ttl"], start, end, value)
+                )
+                self._entries[env] = entries
+
+    def invalidate(self):
+        """Drop all entries in all workers."""
+        path = settings.SESSION_CACHE["generation_file"]
+        tmp_path = F"{path}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, "w") as gen_file:
+                gen_file.write(str(systime.time_ns()))
+            os.replace(tmp_path, path)
+        except OSError:
+            logging.getLogger(__name__).exception(
+                "Unable to update sessions generation file %s", path
+            )
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+
+
+SESSION_CACHE = SessionCache()
+
+
 class RecorderService:
     """Recorder services management class."""
 
@@ -44,52 +165,32 @@ class RecorderService:
             :type time: int POSIX timestamp in ns
 
         """
-        if time is None:
-            str_select = "SELECT last(started), * \
-                          FROM " + RUNNING_SCENARIO_RP + ".RunningScenarios \
-                          WHERE environment='" + env + "'"
-        else:
-            str_select = "SELECT last(started), * \
-                          FROM " + RUNNING_SCENARIO_RP + ".RunningScenarios \
-                          WHERE environment='" + env + "' \
-                          AND time <=" + str(time)
+        found, session = SESSION_CACHE.get(env, time)
+        if not found:
+            session, start, end = self._query_session(env, time)
+            SESSION_CACHE.put(env, start, end, session)
 
-        if settings.INFLUX["user"] is not None:
-            auth = (settings.INFLUX["user"], settings.INFLUX["pass"])
-        else:
-            auth = None
+        if session is None:
+            err_text = "Can't find any recording session "
+            err_text += F"for recorder \"{env}\""
 
-        influx_url = settings.INFLUX["host"] + "/query?q="
-        influx_url += urllib.parse.quote(str_select)
-        influx_url += "&db=" + urllib.parse.quote(settings.INFLUX["db"])
-        response = requests.get(influx_url, auth=auth, verify=False)
+            raise RecordingException(err_text, 404)
+
+        return RunningScenarioClass(env, session[0], session[1])
+
+    def _query_row(self, env, str_select):
+        """Execute query and return first row (None if no result)."""
+        response = InfluxService().query(str_select, epoch="ns")
         if response.status_code == 200:
             json_object = json.loads(response.text)
 
             if "series" in json_object["results"][0]:
-                scenario = json_object["results"][0]["series"][0]["values"][0][3]
-                step = json_object["results"][0]["series"][0]["values"][0][5]
-                started = json_object["results"][0]["series"][0]["values"][0][4
-                ]
-                if started == 1:
-                    result = RunningScenarioClass(env, scenario, step)
-                    return result
-                else:
-                    err_text = "Can't find any recording session "
-                    err_text += F"for recorder \"{env}\""
-                    
-                    raise RecordingException(err_text, 404)
-            else:
-                err_text = "Can't find any recording session "
-                err_text += F"for recorder \"{env}\""
-                    
-                raise RecordingException(err_text, 404)
+                return json_object["results"][0]["series"][0]["values"][0]
+            return None
         else:
             err_text = "Can't find any recording session "
             err_text += F"for recorder \"{env}\""
 
-            log_msg = "Error while contacting influxDB HTTP Code={} Body={}"
-            log_msg = log_msg.format(response.status_code, response.text)
             self.logger.error(
                 "Error while contacting influxDB HTTP Code=%d Body=%s",
                 response.status_code,
@@ -97,6 +198,47 @@ class RecorderService:
             )
             raise RecordingException(err_text, response.status_code)
 
+    def _query_session(self, env, time):
+        """
+        Query influxDB for recording session.
+
+        Return a (session, start, end) tuple where session is a
+        (scenario, step) tuple or None if no session is running, and
+        start/end are the timestamps (in ns) of the session changes
+        surrounding time (None if there is none).
+        """
+        if time is None:
+            str_select = "SELECT last(started), * \
+                          FROM " + RUNNING_SCENARIO_RP + ".RunningScenarios \
+                          WHERE environment='" + env + "'"
+        else:
+            str_select = "SELECT last(started), * \
+                          FROM " + RUNNING_SCENARIO_RP + ".RunningScenarios \
+                          WHERE environment='" + env + "' \
+                          AND time <=" + str(time)
+
+        session = None
+        start = None
+        row = self._query_row(env, str_select)
+        if row is not None:
+            start = row[0]
+            if row[4] == 1:
+                session = (row[3], row[5])
+
+        end = None
+        if time is not None:
+            # Next session change (if any) ends lookup validity
+            row = self._query_row(
+                env,
+                "SELECT first(started) \
+                 FROM " + RUNNING_SCENARIO_RP + ".RunningScenarios \
+                 WHERE environment='" + env + "' \
+                 AND time >" + str(time)
+            )
+            if row is not None:
+                end = row[0]
+        return (session, start, end)
+
     # pylint: disable=no-self-use
     def store_session(self, env, scenario, step, started=1):
         """
@@ -114,35 +256,29 @@ class RecorderService:
         """
         result = RunningScenarioClass(env, scenario, step)
 
-        influx_data = "RunningScenarios,environment="
-        influx_data += result.environment.replace(' ', '\\ ')
-        influx_data += ",scenario="
-        influx_data += result.scenario.replace(' ', '\\ ')
-        influx_data += ",step="
-        influx_data += result.step.replace(' ', '\\ ')
-        influx_data += " started=" + str(started)
+        influx_data = PointEncoder("RunningScenarios").encode(
+            (
+                ("environment", result.environment),
+                ("scenario", result.scenario),
+                ("step", result.step)
+            ),
+            (("started", started),)
+        )
 
         self.logger.debug(settings.INFLUX["host"] +
                           "/write?db=" + settings.INFLUX["db"])
         self.logger.debug(influx_data)
 
-        if settings.INFLUX["user"] is not None:
-            auth = (settings.INFLUX["user"], settings.INFLUX["pass"])
-        else:
-            auth = None
-
-        influx_url = settings.INFLUX["host"]
-        influx_url += "/write?db="
-        influx_url += settings.INFLUX["db"]
-        influx_url += "&rp=" + RUNNING_SCENARIO_RP
-        response = requests.post(
-            influx_url,
-            data=influx_data,
-            auth=auth,
-            verify=False)
+        response = InfluxService().write(
+            influx_data,
+            retention_policy=RUNNING_SCENARIO_RP
+        )
         if response.status_code != 204:
             log_msg = F"Error while storing recorder: {response.text}"
             
             raise RecordingException(log_msg, 500)
 
+        # Session changed: lookups cached by any worker are outdated
+        SESSION_CACHE.invalidate()
+
         return result
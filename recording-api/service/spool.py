@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""On-disk spool for measurements influxDB failed to store."""
+# --------------------------------------------------------
+# Module Name : power recording API
+# Version : 1.0
+#
+# Copyright © 2022 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Append-only spool of line protocol data replayed to influxDB.
+#
+#     Each worker appends to its own segment file ("*.open"). Segments
+#     are closed ("*.lp") when they are big or old enough, then replayed
+#     in creation order by the worker holding the spool lock.
+
+import atexit
+import fcntl
+import glob
+import logging
+import os
+import threading
+import time
+
+import requests
+
+import settings
+from service.influx import InfluxService
+
+
+class MeasurementsSpool:
+    """Segmented append-only spool of line protocol data."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, conf):
+        """
+        Create a MeasurementsSpool instance.
+
+            :param conf: Spool settings (see settings.SPOOL)
+            :type conf: dictionary
+        """
+        self.conf = conf
+        self.directory = conf["directory"]
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_path = None
+        self._segment_opened = None
+        self._dirty = False
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Start spool maintenance thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="influx/spool",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop maintenance thread and close current segment."""
+        self._running = False
+        with self._lock:
+            self._close_segment()
+
+    def append(self, data, nb_points):
+        """
+        Append line protocol data to spool.
+
+            :param data: Line protocol data (each point with a timestamp)
+            :type data: string or bytes
+
+            :param nb_points: Number of points in data
+            :type nb_points: int
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self._lock:
+            if self._segment is None:
+                self._segment_path = os.path.join(
+                    self.directory,
+                    F"{time.time_ns():020d}-{os.getpid()}.open"
+                )
+                self._segment = open(self._segment_path, "ab")
+                self._segment_opened = time.monotonic()
+            self._segment.write(data)
+            if not data.endswith(b"\n"):
+                self._segment.write(b"\n")
+            self._dirty = True
+            if self._segment.tell() >= self.conf["segment_size"]:
+                self._close_segment()
+        self.logger.warning(
+            "%d measurements spooled in %s",
+            nb_points,
+            self.directory
+        )
+
+    def _sync_segment(self):
+        """Flush current segment to disk (lock held)."""
+        if self._segment is not None and self._dirty:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._dirty = False
+
+    def _close_segment(self):
+        """Close current segment and make it replayable (lock held)."""
+        if self._segment is not None:
+            self._sync_segment()
+            self._segment.close()
+            os.rename(
+                self._segment_path,
+                self._segment_path[:-len(".open")] + ".lp"
+            )
+            self._segment = None
+            self._segment_path = None
+
+    def _run(self):
+        """Maintenance thread main code."""
+        last_replay = time.monotonic()
+        while self._running:
+            time.sleep(self.conf["fsync_interval"])
+            try:
+                with self._lock:
+                    if self._segment is not None and (
+                            time.monotonic() - self._segment_opened >=
+                            self.conf["segment_age"]
+                    ):
+                        self._close_segment()
+                    else:
+                        self._sync_segment()
+                if time.monotonic() - last_replay >= \
+                        self.conf["replay_interval"]:
+                    last_replay = time.monotonic()
+                    self._replay()
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Error while maintaining spool")
+
+    @staticmethod
+    def _is_alive(pid):
+        """Check if a process is running."""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _recover_orphans(self):
+        """Make segments left open by dead workers replayable."""
+        for path in glob.glob(os.path.join(self.directory, "*.open")):
+            pid = int(os.path.basename(path)[:-len(".open")].split("-")[1])
+            if pid != os.getpid() and not self._is_alive(pid):
+                self.logger.info("Recovering orphan spool segment %s", path)
+                os.rename(path, path[:-len(".open")] + ".lp")
+
+    def _enforce_limits(self, segments):
+        """Apply retention and disk quota, return remaining segments."""
+        oldest_allowed = time.time_ns() - self.conf["retention"] * 1000000000
+        total_size = sum(
+            os.path.getsize(path)
+            for path in glob.glob(os.path.join(self.directory, "*.open"))
+        )
+        sizes = {path: os.path.getsize(path) for path in segments}
+        total_size += sum(sizes.values())
+
+        remaining = []
+        for path in segments:
+            created = int(os.path.basename(path).split("-")[0])
+            if created < oldest_allowed or \
+                    total_size > self.conf["max_size"]:
+                self.logger.error(
+                    "Dropping spool segment %s (retention or quota exceeded)",
+                    path
+                )
+                os.remove(path)
+                total_size -= sizes[path]
+            else:
+                remaining.append(path)
+        return remaining
+
+    def _send(self, lines):
+        """Write lines to influxDB, return False if it should be retried."""
+        try:
+            response = InfluxService().write(b"".join(lines))
+        except requests.exceptions.RequestException:
+            return False
+        if response.status_code == 204:
+            return True
+        if response.status_code < 500:
+            # Data will never be accepted: do not block the spool
+            self.logger.error(
+                "Dropping %d spooled measurements rejected by influxDB: %s",
+                len(lines),
+                response.text
+            )
+            return True
+        return False
+
+    def _replay_segment(self, path):
+        """Replay a segment, return True if fully replayed."""
+        lines = []
+        with open(path, "rb") as segment:
+            for line in segment:
+                lines.append(line)
+                if len(lines) >= self.conf["batch_points"]:
+                    if not self._send(lines):
+                        return False
+                    lines = []
+        if lines and not self._send(lines):
+            return False
+        os.remove(path)
+        self.logger.info("Spool segment %s replayed", path)
+        return True
+
+    def _replay(self):
+        """Replay closed segments if no other worker is doing it."""
+        with open(os.path.join(self.directory, "replay.lock"), "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            self._recover_orphans()
+            segments = self._enforce_limits(sorted(
+                glob.glob(os.path.join(self.directory, "*.lp"))
+            ))
+            for path in segments:
+                if not self._replay_segment(path):
+                    self.logger.debug("influxDB unavailable: replay delayed")
+                    break
+
+
+_SPOOL = None
+_SPOOL_PID = None
+_SPOOL_LOCK = threading.Lock()
+
+
+def get_spool():
+    """Get (and start if needed) measurements spool of current process."""
+    global _SPOOL, _SPOOL_PID  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _SPOOL is None or _SPOOL_PID != pid:
+        with _SPOOL_LOCK:
+            if _SPOOL is None or _SPOOL_PID != pid:
+                spool = MeasurementsSpool(settings.SPOOL)
+                spool.start()
+                _SPOOL = spool
+                _SPOOL_PID = pid
+    return _SPOOL
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Write-behind buffer for influxDB writes."""
+# --------------------------------------------------------
+# Module Name : power recording API
+# Version : 1.0
+#
+# Copyright © 2022 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Bounded in-process buffer flushed to influxDB in batches.
+
+import atexit
+import collections
+import logging
+import os
+import threading
+import time
+
+import settings
+from service.exception import RecordingException
+from service.influx import InfluxService
+from service.spool import get_spool
+
+
+class WriteBehindBuffer:
+    """
+    Bounded buffer of line protocol data.
+
+    Data are flushed to influxDB by a background thread as soon as
+    "batch_points" points are buffered or when the oldest buffered data
+    is older than "flush_interval" seconds.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, max_points, batch_points, flush_interval):
+        """
+        Create a WriteBehindBuffer instance.
+
+            :param max_points: Max. number of buffered points
+            :type max_points: int
+
+            :param batch_points: Number of points triggering a flush
+            :type batch_points: int
+
+            :param flush_interval: Max. buffering duration (in sec.)
+            :type flush_interval: float
+        """
+        self.max_points = max_points
+        self.batch_points = batch_points
+        self.flush_interval = flush_interval
+        self._items = collections.deque()
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Start flushing thread."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="influx/write-behind",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush buffered data and stop flushing thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(settings.INFLUX["timeout"] * 2)
+
+    def enqueue(self, data, nb_points):
+        """
+        Add line protocol data to buffer.
+
+            :param data: Line protocol data
+            :type data: bytes
+
+            :param nb_points: Number of points in data
+            :type nb_points: int
+
+            :raise RecordingException: (503) when buffer is full
+        """
+        with self._condition:
+            if self._pending + nb_points > self.max_points:
+                raise RecordingException(
+                    "Measurements buffer is full: retry later",
+                    503
+                )
+            self._items.append((data, nb_points, time.monotonic()))
+            self._pending += nb_points
+            if self._pending >= self.batch_points:
+                self._condition.notify()
+
+    def _flush_delay(self):
+        """Return time to wait before next flush (lock held)."""
+        if self._pending >= self.batch_points:
+            return 0
+        if not self._items:
+            return self.flush_interval
+        return self._items[0][2] + self.flush_interval - time.monotonic()
+
+    def _take_batch(self):
+        """Remove at most batch_points points from buffer (lock held)."""
+        batch = []
+        nb_points = 0
+        while self._items and (
+                not batch or
+                nb_points + self._items[0][1] <= self.batch_points
+        ):
+            data, item_points, _ = self._items.popleft()
+            batch.append(data)
+            nb_points += item_points
+        self._pending -= nb_points
+        return batch, nb_points
+
+    def _write(self, batch, nb_points):
+        """Write a batch to influxDB (or to spool if it fails)."""
+        data = b"\n".join(batch)
+        try:
+            response = InfluxService().write(data)
+            if response.status_code == 204:
+                self.logger.debug("%d measurements flushed", nb_points)
+                return
+            self.logger.error(
+                "Error while flushing %d measurements: %s",
+                nb_points,
+                response.text
+            )
+            retry = response.status_code >= 500
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception(
+                "Error while flushing %d measurements",
+                nb_points
+            )
+            retry = True
+        if retry and settings.SPOOL["enabled"]:
+            get_spool().append(data, nb_points)
+
+    def _run(self):
+        """Flushing thread main code."""
+        while True:
+            with self._condition:
+                while self._running and self._flush_delay() > 0:
+                    self._condition.wait(self._flush_delay())
+                if not self._items:
+                    if not self._running:
+                        return
+                    continue
+                batch, nb_points = self._take_batch()
+            self._write(batch, nb_points)
+
+
+_BUFFER = None
+_BUFFER_PID = None
+_BUFFER_LOCK = threading.Lock()
+
+
+def get_buffer():
+    """Get (and start if needed) write-behind buffer of current process."""
+    global _BUFFER, _BUFFER_PID  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _BUFFER is None or _BUFFER_PID != pid:
+        with _BUFFER_LOCK:
+            if _BUFFER is None or _BUFFER_PID != pid:
+                buffer = WriteBehindBuffer(
+                    settings.WRITE_BEHIND["max_points"],
+                    settings.WRITE_BEHIND["batch_points"],
+                    settings.WRITE_BEHIND["flush_interval"]
+                )
+                buffer.start()
+                _BUFFER = buffer
+                _BUFFER_PID = pid
+    return _BUFFER
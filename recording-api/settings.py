@@ -22,6 +22,7 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2017-02-20 : Release of the file
+# 1.1.0 - 2026-10-18 : Add MAX_CONTENT_LENGTH
 # Flask settings
 FLASK_DEBUG = False  # Do not use debug mode in production
 
@@ -39,7 +40,67 @@ API = {
 }
 
 INFLUX = {}
+# Optional INFLUX settings default values
+# pool_size: max. number of keep-alive connections per worker
+# retries: number of retries on connection errors
+# timeout: request timeout (in sec.)
+INFLUX_DEFAULTS = {
+    "pool_size": 10,
+    "retries": 3,
+    "timeout": 10
+}
 BIND = None
 MQTT = {}
 
 ALWAYS_RECORD = True
+
+# Max. size (in bytes) of request bodies, checked after decompression
+# for gzip encoded ones
+MAX_CONTENT_LENGTH = 1024 * 1024 * 1024
+
+# Write-behind mode: measurements are acknowledged when buffered and
+# written to influxDB in batches by a background thread
+# max_points: buffer size, when full API answers 503
+# batch_points: number of buffered points triggering a write
+# flush_interval: max. buffering duration (in sec.)
+WRITE_BEHIND = {
+    "enabled": False,
+    "max_points": 200000,
+    "batch_points": 5000,
+    "flush_interval": 1
+}
+
+# On-disk spool for measurements influxDB failed to store
+# directory: spool location (shared by all workers)
+# segment_size: max. size (in bytes) of a spool file
+# segment_age: max. duration (in sec.) a spool file stay open
+# fsync_interval: max. delay (in sec.) before spooled data are synced
+# replay_interval: delay (in sec.) between replay attempts
+# batch_points: max. number of points per replayed write
+# max_size: disk quota (in bytes), oldest data are dropped beyond
+# retention: max. age (in sec.) of spooled data
+SPOOL = {
+    "enabled": False,
+    "directory": "/var/lib/energyrecorder/spool",
+    "segment_size": 16 * 1024 * 1024,
+    "segment_age": 10,
+    "fsync_interval": 1,
+    "replay_interval": 5,
+    "batch_points": 5000,
+    "max_size": 1024 * 1024 * 1024,
+    "retention": 7 * 24 * 3600
+}
+
+# Streamed measurements (ndjson)
+# batch_points: number of points read from stream before storing them
+STREAM = {
+    "batch_points": 5000
+}
+
+# Recording sessions lookups cache
+# ttl: entries time to live (in sec.), 0 to disable cache
+# generation_file: file shared by workers to signal sessions changes
+SESSION_CACHE = {
+    "ttl": 5,
+    "generation_file": "/tmp/energyrecorder-sessions.gen"
+}
@@ -24,16 +24,34 @@
 # 1.0.0 - 2017-02-20 : Release of the file
 # 1.1.0 - 2018-10-26 : Add feature to synchronize polling of different threads
 # 2.0.0 - 2019-09-26 : Add temperature sensorsreading
+# 2.1.0 - 2026-10-18 : Session token authentication over keep-alive connections
+# 2.2.0 - 2026-10-18 : Fetch chassis resources concurrently
+# 2.3.0 - 2026-10-18 : Use $select/$expand if supported, ETag conditional GETs
+# 2.4.0 - 2026-10-18 : Persistent discovery cache, background rediscovery
+# 2.5.0 - 2026-10-18 : Add push mode (metric reports received over SSE)
+# 2.5.1 - 2026-10-18 : Wait for all chassis resources, restartable executor
+# 2.5.2 - 2026-10-18 : Apply rediscovery results only on success
+# 2.5.3 - 2026-10-18 : Push mode: sum power metrics as power sensor, units
+#                      by metric name
+# 2.5.4 - 2026-10-18 : Keep logged out state if session creation fails
 #
 
 """Collect power comsumption via redfish API."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 import time
 import json
 import logging
+import os
 import sys
+import threading
 import traceback
+from urllib.parse import quote
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from utils.collector import SensorsCollector
 
@@ -47,6 +65,26 @@ class RedfishCollector(SensorsCollector):
     _chassis_list = None
     type = "redfish"
 
+    # Push mode: max. readings kept between 2 pollings (oldest are dropped)
+    MAX_PUSHED = 100000
+    # Push mode: reconnect to event stream if nothing was received since
+    # (sec.)
+    PUSH_TIMEOUT = 300
+    # Push mode: delay before reconnecting to event stream (sec.)
+    PUSH_RETRY = 5
+    # Delay before retrying a failed background rediscovery (sec.)
+    DISCOVERY_RETRY = 300
+    # Push mode: metrics summed as "power" sensor (as in poll mode)
+    POWER_METRICS = ("PowerConsumedWatts", "PowerWatts")
+    # Push mode: units of metrics by name suffix
+    METRIC_UNITS = (
+        ("Watts", "W"),
+        ("Celsius", "Celsius"),
+        ("RPM", "RPM"),
+        ("Volts", "V"),
+        ("Amps", "A")
+    )
+
     def __init__(self, environment, server_id, server_conf, data_server_conf):
         super().__init__(
             environment, server_id, server_conf, data_server_conf
@@ -55,6 +93,202 @@ class RedfishCollector(SensorsCollector):
             self.server_conf["temperature"] = True
         if "power" not in self.server_conf:
             self.server_conf["power"] = True
+        if "session_auth" not in self.server_conf:
+            self.server_conf["session_auth"] = True
+        if "concurrency" not in self.server_conf:
+            self.server_conf["concurrency"] = 4
+        if "etag" not in self.server_conf:
+            self.server_conf["etag"] = True
+        if "mode" not in self.server_conf:
+            self.server_conf["mode"] = "poll"
+
+        # Keep-alive connections to BMC (one per concurrent request)
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.server_conf["concurrency"]
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Chassis resources fetching threads (see _submit)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._session_uri = None
+        self._auth_lock = threading.Lock()
+
+        # Service query parameters support (see _load_features)
+        self._select = False
+        self._expand = False
+        # Last ETag and document by resource URL
+        self._etags = {}
+        self._logged_in = False
+
+        # Chassis discovery cache and refresh
+        self.discovery_conf = {
+            "directory": None,
+            "ttl": 86400,
+            "max_errors": 3
+        }
+        self.discovery_conf.update(self.server_conf.get("discovery", {}))
+        self._conf_base_url = self.server_conf["base_url"]
+        self._discovery_time = 0
+        self._discovery_retry = 0
+        self._refreshing = False
+        self._errors = 0
+
+        # Push mode: events reader and readings received since last polling
+        self._push_thread = None
+        self._stream = None
+        self._pushed = deque(maxlen=self.MAX_PUSHED)
+        self._pushed_lock = threading.Lock()
+
+    def _login(self):
+        """
+        Authenticate to BMC.
+
+        Create a Redfish session (SessionService) and use its token for
+        next requests, or use basic authentication if sessions are not
+        supported (or disabled).
+        Collector is only marked as logged in once authentication is set,
+        so that a failed attempt is retried at next request.
+        """
+        if self.pod_auth is None or not self.server_conf["session_auth"]:
+            self.session.auth = self.pod_auth
+            self._logged_in = True
+            return
+
+        request_url = self.server_conf["base_url"]
+        request_url += "/redfish/v1/SessionService/Sessions"
+        self.log.debug(
+            "[%s]: Creating session at %s",
+            self.name,
+            request_url
+        )
+        # Concurrent requests keep using current token until replaced
+        response = self.session.post(
+            request_url,
+            json={
+                "UserName": self.server_conf["user"],
+                "Password": self.server_conf["pass"]
+            },
+            headers={"X-Auth-Token": None}
+        )
+        token = response.headers.get("X-Auth-Token")
+        if response.status_code not in (200, 201) or token is None:
+            self.log.warning(
+                "[%s]: Unable to create session (HTTP STATUS=%d), "
+                "using basic authentication",
+                self.name,
+                response.status_code
+            )
+            self.session.auth = self.pod_auth
+            self.session.headers.pop("X-Auth-Token", None)
+            self._logged_in = True
+            return
+
+        self.session.auth = None
+        self.session.headers["X-Auth-Token"] = token
+        self._logged_in = True
+        self._session_uri = response.headers.get("Location")
+        if self._session_uri is not None and \
+                self._session_uri.startswith("/"):
+            self._session_uri = (
+                self.server_conf["base_url"] + self._session_uri
+            )
+
+    def _logout(self):
+        """Delete Redfish session (if any)."""
+        self._logged_in = False
+        token = self.session.headers.pop("X-Auth-Token", None)
+        session_uri, self._session_uri = self._session_uri, None
+        if token is None or session_uri is None:
+            return
+        try:
+            self.session.delete(
+                session_uri,
+                headers={"X-Auth-Token": token}
+            )
+        except Exception:  # pylint: disable=locally-disabled,broad-except
+            self.log.debug(
+                "[%s]: Unable to delete session %s: %s",
+                self.name,
+                session_uri,
+                traceback.format_exc()
+            )
+
+    def _get(self, request_url, headers=None, **kwargs):
+        """GET a Redfish resource (authenticate again if session expired)."""
+        token = self.session.headers.get("X-Auth-Token")
+        response = self.session.get(request_url, headers=headers, **kwargs)
+        if response.status_code == 401 and token is not None:
+            with self._auth_lock:
+                if self.session.headers.get("X-Auth-Token") == token:
+                    self.log.info(
+                        "[%s]: Session expired, authenticating again",
+                        self.name
+                    )
+                    self._session_uri = None
+                    self._login()
+            # Release connection (not done by streamed responses)
+            response.close()
+            response = self.session.get(request_url, headers=headers, **kwargs)
+        return response
+
+    def _get_document(self, request_url, select=None):
+        """
+        Get a Redfish resource as JSON document.
+
+        Only select properties are requested if service supports $select,
+        and documents are not downloaded again if their ETag did not change.
+
+            :param request_url: Resource URL
+            :type request_url: string
+
+            :param select: Properties to get
+            :type select: list of string
+        """
+        if select and self._select:
+            request_url += "?$select=" + ",".join(select)
+        headers = {}
+        cached = self._etags.get(request_url)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        response = self._get(request_url, headers)
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        document = json.loads(response.text)
+        etag = response.headers.get("ETag")
+        if self.server_conf["etag"] and etag and response.status_code == 200:
+            self._etags[request_url] = (etag, document)
+        return document
+
+    def _load_features(self):
+        """
+        Get query parameters supported by service (service root).
+
+        Return ($select supported, $expand supported) tuple.
+        """
+        request_url = self.server_conf["base_url"] + "/redfish/v1/"
+        response = self._get(request_url)
+        features = {}
+        if response.status_code == 200:
+            features = json.loads(response.text).get(
+                "ProtocolFeaturesSupported", {}
+            )
+        select = features.get("SelectQuery", False) is True
+        # Expand chassis list members ($expand=.)
+        expand = features.get("ExpandQuery", {})
+        expand = isinstance(expand, dict) and \
+            expand.get("NoLinks", False) is True
+        self.log.debug(
+            "[%s]: $select supported: %s, $expand supported: %s",
+            self.name,
+            select,
+            expand
+        )
+        return (select, expand)
 
     def _is_https(self,):
         """Try to determine if host is using https or not."""
@@ -66,7 +300,7 @@ class RedfishCollector(SensorsCollector):
                 self.name,
                 url
             )
-            requests.get(url, verify=False)
+            self.session.get(url)
             return True
         except requests.exceptions.ConnectionError:
             url = url.replace("https", "http")
@@ -75,7 +309,7 @@ class RedfishCollector(SensorsCollector):
                 self.name,
                 url
             )
-            requests.get(url)
+            self.session.get(url)
             return False
 
     def get_chassis_def(self, chassis_url):
@@ -89,9 +323,7 @@ class RedfishCollector(SensorsCollector):
             request_url
         )
 
-        response = requests.get(request_url,
-                                auth=self.pod_auth,
-                                verify=False)
+        response = self._get(request_url)
         if response.status_code != 200:
             self.log.error(
                 "[%s]: Error while calling %s\nHTTP "
@@ -101,11 +333,106 @@ class RedfishCollector(SensorsCollector):
                 response.status_code,
                 response.text
             )
-            self.running = False
             return None
         else:
             return json.loads(response.text)
 
+    def _discover(self, new_session=True):
+        """
+        Discover server chassis and their resources (one attempt).
+
+        Return chassis list, or None if BMC answered with an error.
+        Service features and ETags cache used by running pollings are
+        only replaced on success.
+
+            :param new_session: If False, keep current session (used by
+                                running pollings)
+            :type new_session: bool
+        """
+        if new_session:
+            self._logout()
+            self._login()
+        elif not self._logged_in:
+            self._login()
+        select, expand = self._load_features()
+
+        request_url = self.server_conf["base_url"]
+        request_url += "/redfish/v1/Chassis/"
+        if expand:
+            # Get chassis definitions with list (single request)
+            request_url += "?$expand=."
+        self.log.debug(
+            "[%s]: Chassis list at %s ",
+            self.name,
+            request_url
+        )
+        response = self._get(request_url)
+        if response.status_code != 200:
+            self.log.error(
+                "[%s]: Error while calling %s\nHTTP "
+                "STATUS=%d\nHTTP BODY=%s",
+                self.name,
+                request_url,
+                response.status_code,
+                response.text
+            )
+            return None
+
+        chassis_list = json.loads(response.text)
+        chassis_defs = {}
+        for chassis in chassis_list["Members"]:
+            if "Id" in chassis:
+                # Expanded member
+                chassis_defs[chassis["@odata.id"]] = chassis
+        chassis_list["Members"] = [
+            {"@odata.id": chassis["@odata.id"]}
+            for chassis in chassis_list["Members"]
+        ]
+        for chassis in chassis_list["Members"]:
+            chassis_def = chassis_defs.get(chassis["@odata.id"])
+            if chassis_def is None:
+                chassis_def = self.get_chassis_def(
+                    chassis["@odata.id"]
+                )
+            if chassis_def is None:
+                return None
+            chassis["Id"] = chassis_def["Id"]
+            if "Thermal" in chassis_def:
+                chassis["HaveThermal"] = True
+            else:
+                chassis["HaveThermal"] = False
+            self.log.debug(
+                "[%s]: chassis %s has Thermal data: %s",
+                self.name,
+                chassis["@odata.id"],
+                chassis["HaveThermal"]
+            )
+            # New URI to get power but depend on SW release of BMC on requested server
+            if "EnvironmentMetrics" in chassis_def:
+                chassis["HaveEnvironmentMetrics"] = True
+                # This does not ensure that PowerWatts is embedded but 1st request will update it
+            else:
+                chassis["HaveEnvironmentMetrics"] = False
+            # Deprecated since 2020 datamodel but can be the only way depending on BMC SW release
+            if "Power" in chassis_def:
+                chassis["HavePower"] = True
+            else:
+                chassis["HavePower"] = False
+            self.log.debug(
+                "[%s]: chassis %s has environemental data: Thermal(%s),"
+                " EnvironementalMetrics(%s), Power --deprecated--(%s)",
+                self.name,
+                chassis["@odata.id"],
+                chassis["HaveThermal"],
+                chassis["HaveEnvironmentMetrics"],
+                chassis["HavePower"]
+            )
+        self._select = select
+        self._expand = expand
+        # Resources may have changed: forget cached documents
+        self._etags = {}
+        return chassis_list
+
     def load_chassis_list(self):
         """Get Chassis List for server Redfish API."""
         chassis_list = None
@@ -113,63 +440,9 @@ class RedfishCollector(SensorsCollector):
         # Get Chassis list
         while chassis_list is None and self.running:
             try:
-                request_url = self.server_conf["base_url"]
-                request_url += "/redfish/v1/Chassis/"
-                self.log.debug(
-                    "[%s]: Chassis list at %s ",
-                    self.name,
-                    request_url
-                )
-                response = requests.get(request_url,
-                                        auth=self.pod_auth,
-                                        verify=False)
-                if response.status_code != 200:
-                    self.log.error(
-                        "[%s]: Error while calling %s\nHTTP "
-                        "STATUS=%d\nHTTP BODY=%s",
-                        self.name,
-                        request_url,
-                        response.status_code,
-                        response.text
-                    )
+                chassis_list = self._discover()
+                if chassis_list is None:
                     self.running = False
-                else:
-                    chassis_list = json.loads(response.text)
-                    for chassis in chassis_list["Members"]:
-                        chassis_def = self.get_chassis_def(
-                            chassis["@odata.id"]
-                        )
-                        chassis["Id"] = chassis_def["Id"]
-                        if "Thermal" in chassis_def:
-                            chassis["HaveThermal"] = True
-                        else:
-                            chassis["HaveThermal"] = False
-                        self.log.debug(
-                            "[%s]: chassis %s has Thermal data: %s",
-                            self.name,
-                            chassis["@odata.id"],
-                            chassis["HaveThermal"]
-                        )
-                        # New URI to get power but depend on SW release of BMC on requested server
-                        if "EnvironmentMetrics" in chassis_def:
-                            chassis["HaveEnvironmentMetrics"] = True
-                            # This does not ensure that PowerWatts is embedded but 1st request will update it
-                        else:
-                            chassis["HaveEnvironmentMetrics"] = False
-                        # Deprecated since 2020 datamodel but can be the only way depending on BMC SW release
-                        if "Power" in chassis_def:
-                            chassis["HavePower"] = True
-                        else:
-                            chassis["HavePower"] = False
-                        self.log.debug(
-                            "[%s]: chassis %s has environemental data: Thermal(%s),"
-                            " EnvironementalMetrics(%s), Power --deprecated--(%s)",
-                            self.name,
-                            chassis["@odata.id"],
-                            chassis["HaveThermal"],
-                            chassis["HaveEnvironmentMetrics"],
-                            chassis["HavePower"]
-                        )
 
             except Exception:  # pylint: disable=locally-disabled,broad-except
                 self.log.error(
@@ -202,10 +475,10 @@ class RedfishCollector(SensorsCollector):
                 self.name,
                 rqt_url + "EnvironmentMetrics/"
             )
-            response = requests.get(rqt_url + "EnvironmentMetrics/",
-                                    auth=self.pod_auth,
-                                    verify=False)
-            power_metrics = json.loads(response.text)
+            power_metrics = self._get_document(
+                rqt_url + "EnvironmentMetrics/",
+                ["PowerWatts"]
+            )
             
             if "PowerWatts" in power_metrics:
                 chassis_power += power_metrics["PowerWatts"]["Reading"]
@@ -224,10 +497,10 @@ class RedfishCollector(SensorsCollector):
                 self.name,
                 rqt_url + "Power/"
             )
-            response = requests.get(rqt_url + "Power/",
-                                    auth=self.pod_auth,
-                                    verify=False)
-            power_metrics = json.loads(response.text)
+            power_metrics = self._get_document(
+                rqt_url + "Power/",
+                ["PowerControl"]
+            )
 
             for pwr in power_metrics["PowerControl"]:
                 # PowerControl is a list which nb elements depends on provider 
@@ -269,12 +542,7 @@ class RedfishCollector(SensorsCollector):
             self.name,
             rqt_url
         )
-        response = requests.get(
-            rqt_url,
-            auth=self.pod_auth,
-            verify=False
-        )
-        thermal_metrics = json.loads(response.text)
+        thermal_metrics = self._get_document(rqt_url, ["Temperatures"])
         
         self.log.debug(
             "[%s]: Thermal collected",
@@ -291,14 +559,303 @@ class RedfishCollector(SensorsCollector):
                 result.append(temp)
         return result
 
+    def _discovery_file(self):
+        """Get discovery cache file of server."""
+        return os.path.join(
+            self.discovery_conf["directory"],
+            quote("{}_{}".format(self.environment, self.server_id), safe="")
+            + ".json"
+        )
+
+    def _load_discovery(self):
+        """Load chassis list from discovery cache (return True if loaded)."""
+        if not self.discovery_conf["directory"]:
+            return False
+        try:
+            with open(self._discovery_file(), "r") as stream:
+                cache = json.load(stream)
+            if cache.get("host") != self._conf_base_url:
+                # Server settings changed
+                return False
+            base_url = cache["base_url"]
+            select = cache["select"]
+            expand = cache["expand"]
+            discovery_time = cache["time"]
+            chassis_list = cache["chassis_list"]
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.log.warning(
+                "[%s]: Unable to read discovery cache %s",
+                self.name,
+                self._discovery_file()
+            )
+            return False
+
+        self.server_conf["base_url"] = base_url
+        self._select = select
+        self._expand = expand
+        self._discovery_time = discovery_time
+        self._chassis_list = chassis_list
+        self.log.info(
+            "[%s]: Chassis list loaded from %s",
+            self.name,
+            self._discovery_file()
+        )
+        return True
+
+    def _save_discovery(self):
+        """Store chassis list in discovery cache."""
+        if not self.discovery_conf["directory"]:
+            return
+        cache = {
+            "host": self._conf_base_url,
+            "base_url": self.server_conf["base_url"],
+            "select": self._select,
+            "expand": self._expand,
+            "time": self._discovery_time,
+            "chassis_list": self._chassis_list
+        }
+        try:
+            os.makedirs(self.discovery_conf["directory"], exist_ok=True)
+            tmp_file = self._discovery_file() + ".tmp"
+            with open(tmp_file, "w") as stream:
+                json.dump(cache, stream)
+            os.replace(tmp_file, self._discovery_file())
+        except OSError:
+            self.log.exception(
+                "[%s]: Unable to write discovery cache",
+                self.name
+            )
+
+    def _refresh_discovery(self):
+        """Discover chassis again (in background) and update cache."""
+        self.log.info("[%s]: Refreshing chassis discovery", self.name)
+        chassis_list = None
+        try:
+            chassis_list = self._discover(new_session=False)
+        except Exception:  # pylint: disable=locally-disabled,broad-except
+            self.log.debug(
+                "[%s]: %s",
+                self.name,
+                traceback.format_exc()
+            )
+        if chassis_list is None:
+            self.log.warning(
+                "[%s]: Chassis discovery failed, keeping previous one "
+                "(next attempt in %ds)",
+                self.name,
+                self.DISCOVERY_RETRY
+            )
+            self._discovery_retry = time.time() + self.DISCOVERY_RETRY
+        else:
+            self._chassis_list = chassis_list
+            # Next attempt after TTL (or errors)
+            self._discovery_time = time.time()
+            self._save_discovery()
+        self._refreshing = False
+
+    @classmethod
+    def _get_unit(cls, metric):
+        """Get unit of a metric from its name (empty if unknown)."""
+        for suffix, unit in cls.METRIC_UNITS:
+            if metric.endswith(suffix):
+                return unit
+        return ""
+
+    @staticmethod
+    def _get_sensor(metric_property):
+        """
+        Get sensor name of a metric property.
+
+        Properties of a chassis are named after chassis Id (as in poll
+        mode), ex. "/redfish/v1/Chassis/1/Thermal#/Temperatures/0/
+        ReadingCelsius" is "1/Thermal/Temperatures/0/ReadingCelsius".
+        """
+        name = metric_property.replace("#", "")
+        name = name.replace("/redfish/v1/", "", 1)
+        if name.startswith("Chassis/"):
+            name = name[len("Chassis/"):]
+        return name.strip("/").replace("//", "/")
+
+    @staticmethod
+    def _get_timestamp(str_time):
+        """Get timestamp (in ns) from ISO 8601 time, None if not valid."""
+        if not str_time:
+            return None
+        try:
+            value = datetime.fromisoformat(str_time.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return (value - epoch) // timedelta(microseconds=1) * 1000
+
+    def _on_event(self, data):
+        """
+        Store readings of a pushed metric report.
+
+        Power metrics (see POWER_METRICS) are summed as "power" sensor
+        (by timestamp), other metrics are stored as sensors named after
+        their property (see _get_sensor), or their id.
+        """
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+
+        readings = []
+        power = {}
+        for metric in event.get("MetricValues", []):
+            metric_property = metric.get("MetricProperty") or ""
+            metric_id = metric.get("MetricId") or \
+                metric_property.rsplit("/", 1)[-1]
+            try:
+                value = float(metric["MetricValue"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not metric_id:
+                continue
+            timestamp = self._get_timestamp(metric.get("Timestamp"))
+            unit = self._get_unit(metric_id)
+            if metric_id in self.POWER_METRICS:
+                if self.server_conf["power"]:
+                    power[timestamp] = power.get(timestamp, 0) + value
+            elif unit != "Celsius" or self.server_conf["temperature"]:
+                readings.append(self.generate_sensor_data(
+                    self._get_sensor(metric_property) or metric_id,
+                    unit,
+                    value,
+                    timestamp
+                ))
+        for timestamp, value in power.items():
+            readings.append(self.generate_sensor_data(
+                "power", "W", value, timestamp
+            ))
+        with self._pushed_lock:
+            self._pushed.extend(readings)
+
+    def _get_event_stream(self):
+        """Get SSE event stream URL (None if not supported)."""
+        request_url = self.server_conf["base_url"]
+        request_url += "/redfish/v1/EventService"
+        response = self._get(request_url)
+        if response.status_code != 200:
+            return None
+        sse_uri = json.loads(response.text).get("ServerSentEventUri")
+        if not sse_uri:
+            return None
+        if sse_uri.startswith("/"):
+            sse_uri = self.server_conf["base_url"] + sse_uri
+        return sse_uri
+
+    def _read_events(self):
+        """Read metric reports pushed by BMC until collector stops."""
+        sse_url = None
+        while self.running:
+            try:
+                if not self._logged_in:
+                    self._login()
+                if sse_url is None:
+                    sse_url = self._get_event_stream()
+                    if sse_url is None:
+                        self.log.warning(
+                            "[%s]: Event stream (SSE) not supported, "
+                            "using polling",
+                            self.name
+                        )
+                        self._push_thread = None
+                        return
+
+                self._stream = self._get(
+                    sse_url,
+                    {"Accept": "text/event-stream"},
+                    stream=True,
+                    timeout=(10, self.PUSH_TIMEOUT)
+                )
+                if self._stream.status_code != 200:
+                    raise Exception(
+                        "HTTP STATUS={}".format(self._stream.status_code)
+                    )
+                self.log.info(
+                    "[%s]: Receiving metric reports from %s",
+                    self.name,
+                    sse_url
+                )
+                self._stream.encoding = "utf-8"
+                data = []
+                for line in self._stream.iter_lines(decode_unicode=True):
+                    if line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        # End of event
+                        self._on_event("\n".join(data))
+                        data = []
+            except Exception:  # pylint: disable=locally-disabled,broad-except
+                if self.running:
+                    self.log.warning(
+                        "[%s]: Event stream error: %s",
+                        self.name,
+                        sys.exc_info()[1]
+                    )
+                    self.log.debug(
+                        "[%s]: %s",
+                        self.name,
+                        traceback.format_exc()
+                    )
+            finally:
+                if self._stream is not None:
+                    self._stream.close()
+                    self._stream = None
+            if self.running:
+                time.sleep(self.PUSH_RETRY)
+
     def pre_run(self):
         """Load chassis list and initialiaze collector."""
-        if not self._is_https():
-            self.server_conf["base_url"] = (
-                self.server_conf["base_url"].replace("https", "http")
-            )
+        if not self._load_discovery():
+            # Not in cache (else session is created at first polling)
+            if not self._is_https():
+                self.server_conf["base_url"] = (
+                    self.server_conf["base_url"].replace("https", "http")
+                )
 
-        self._chassis_list = self.load_chassis_list()
+            self._chassis_list = self.load_chassis_list()
+            if self._chassis_list:
+                self._discovery_time = time.time()
+                self._save_discovery()
+
+        if self.server_conf["mode"] == "push" and self._push_thread is None:
+            self._push_thread = threading.Thread(
+                target=self._read_events,
+                name=self.name + "/events",
+                daemon=True
+            )
+            self._push_thread.start()
+
+    def post_run(self):
+        """Release Redfish session."""
+        stream = self._stream
+        if stream is not None:
+            # Interrupt events reader
+            stream.close()
+        self._logout()
+        self.session.close()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, func, *args):
+        """Run a chassis resource fetching in executor threads."""
+        with self._executor_lock:
+            if self._executor is None:
+                # Created on first use (or again after post_run)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.server_conf["concurrency"],
+                    thread_name_prefix=self.name
+                )
+            return self._executor.submit(func, *args)
 
     def get_sensors(self):
         """Get Box power."""
@@ -310,17 +867,57 @@ class RedfishCollector(SensorsCollector):
             self.pre_run()
             self.running = running
 
-        power = 0
-        thermal = []
+        if self._push_thread is not None:
+            # Push mode: forward readings received since last polling
+            with self._pushed_lock:
+                readings = list(self._pushed)
+                self._pushed.clear()
+            return readings
+
+        if not self._refreshing and \
+                time.time() >= self._discovery_retry and (
+                time.time() - self._discovery_time >
+                self.discovery_conf["ttl"] or
+                self._errors >= self.discovery_conf["max_errors"]
+        ):
+            # Discovery is outdated or does not match server anymore
+            self._refreshing = True
+            self._errors = 0
+            threading.Thread(
+                target=self._refresh_discovery,
+                name=self.name + "/discovery",
+                daemon=True
+            ).start()
+
+        if not self._logged_in:
+            self._login()
+
+        # Fetch chassis resources concurrently
+        thermal_futures = []
+        power_futures = []
         for chassis in self._chassis_list['Members']:
+            if chassis["HaveThermal"] and self.server_conf["temperature"]:
+                thermal_futures.append(self._submit(
+                    self.get_chassis_thermal,
+                    chassis["@odata.id"],
+                    chassis["Id"]
+                ))
+            if chassis["HavePower"] and self.server_conf["power"]:
+                power_futures.append(self._submit(
+                    self.get_chassis_power,
+                    chassis
+                ))
+        wait(thermal_futures + power_futures)
 
+        power = 0
+        thermal = []
+        failed = False
+        for future in thermal_futures + power_futures:
             try:
-                if chassis["HaveThermal"] and self.server_conf["temperature"]:
-                    thermal += self.get_chassis_thermal(
-                        chassis["@odata.id"], chassis["Id"]
-                    )
-                if chassis["HavePower"] and self.server_conf["power"]:
-                        power += self.get_chassis_power(chassis)
+                if future in thermal_futures:
+                    thermal += future.result()
+                else:
+                    power += future.result()
 
             except Exception:  # pylint: disable=broad-except
                 # No: default case
@@ -341,7 +938,11 @@ class RedfishCollector(SensorsCollector):
                     "[%s]: %s",
                     self.name, err_text
                 )
-                return 0
+                failed = True
+        if failed:
+            self._errors += 1
+            return 0
+        self._errors = 0
         pwr = []
         pwr.append(self.generate_sensor_data("power", "W", power))
         return pwr + thermal
@@ -24,14 +24,35 @@
 # History     :
 # 1.0.0 - 2017-02-20 : Release of the file
 # 1.1.0 - 2018-10-26 : Add feature to synchronize polling of different threads
+# 1.2.0 - 2026-10-18 : Add asyncio polling engine
+# 1.3.0 - 2026-10-18 : Add pod level bounded workers pool
+# 1.4.0 - 2026-10-18 : Add multi-processes sharding of servers
+# 1.5.0 - 2026-10-18 : Schedule polling with drift-free deadlines
+# 1.6.0 - 2026-10-18 : Add servers polling intervals and jitter
+# 1.7.0 - 2026-10-18 : Skip ticks for busy collectors, log their counters
+# 1.8.0 - 2026-10-18 : Flush batching uploaders on stop
+# 1.9.0 - 2026-10-18 : Add optional Prometheus metrics endpoint
+# 1.10.0 - 2026-10-18 : Reload configuration on SIGHUP
+# 1.11.0 - 2026-10-18 : Add Redfish session_auth setting
+# 1.12.0 - 2026-10-18 : Add Redfish concurrency setting
+# 1.13.0 - 2026-10-18 : Add Redfish etag setting
+# 1.14.0 - 2026-10-18 : Add Redfish discovery cache settings
+# 1.15.0 - 2026-10-18 : Add Redfish mode setting
+# 1.16.0 - 2026-10-18 : Restart crashing workers with exponential backoff
+# 1.17.0 - 2026-10-18 : Reload configuration from main loop, compare pod
+#                       and discovery settings to reuse collectors
 ##
+from concurrent.futures import ThreadPoolExecutor
 import logging.config
+import multiprocessing
+import os
 import signal
 import sys
 import threading
 from threading import Thread
 import time
 import traceback
+import zlib
 
 import yaml
 
@@ -47,10 +68,40 @@ from collectors.power.ilocollector import ILOCollector
 from collectors.power.intel_gui_collector import INTELGUICollector
 from collectors.power.ipmicollector import IPMICollector
 from collectors.shellycollector import ShellyCollector
+from utils.asyncengine import AsyncEngine, AsyncPoller
+from utils.metrics import MetricsServer
+from utils.scheduler import DeadlineScheduler, PollingScheduler
+from utils.scheduler import schedule_collectors
+from utils.uploader import stop_uploaders
 
 # Create a list of active pollers
 POLLERS = []
 
+# Worker processes by shard (supervisor only)
+WORKERS = {}
+
+# Running configuration (updated on reload)
+CONFIG = {}
+
+# Delay (in sec.) before restarting a dead worker process, doubled at
+# each crash up to MAX_RESTART_DELAY and reset once a worker ran longer
+# than MAX_RESTART_DELAY
+RESTART_DELAY = 1
+MAX_RESTART_DELAY = 60
+
+# Servers shard polled by current process: (index, number of shards)
+SHARD = (0, 1)
+
+# Engine running asyncio pollers
+ASYNC_ENGINE = None
+
+# Set by SIGHUP handler, configuration is reloaded by main loop
+RELOAD = threading.Event()
+
+# Pod settings applied by pollers: collectors are kept when they change
+POLLER_SETTINGS = ("servers", "polling_interval", "jitter", "overrun",
+                   "workers", "active")
+
 
 class Poller(Thread):
     """Execute synchronized polling opn a set of collectors."""
@@ -61,52 +112,89 @@ class Poller(Thread):
         self.logger = logging.getLogger(__name__)
         self.conf = conf
         self.running = False
-        self.condition = threading.Condition()
         self.name = "poller/{}".format(conf["environment"])
         if self.conf["polling_interval"] <= 0:
             self.conf["polling_interval"] = 0.1
+        self.scheduler = PollingScheduler(
+            self.name,
+            self.conf.get("overrun", DeadlineScheduler.SKIP)
+        )
+        self._new_conf = None
+        # Pool mode only
+        self._pool = None
+        self._futures = {}
 
-    def _notity_collectors(self):
+    def _notity_collectors(self, collectors):
         """Notify collectors to execute power reading."""
-        self.condition.acquire()
-        self.condition.notify_all()
-        self.condition.release()
+        for _collector in collectors:
+            _collector.condition.acquire()
+            _collector.condition.notify_all()
+            _collector.condition.release()
 
     def stop(self):
         """Request stop on running thread."""
         self.running = False
+        self.scheduler.stop()
+
+    def reconfigure(self, conf):
+        """
+        Request poller to apply a new configuration.
+
+        Collectors which are not in the new configuration are stopped, new
+        ones are started, others keep running.
+
+            :param conf: New poller configuration (see start_pollers)
+            :type conf: dictionary
+        """
+        self._new_conf = conf
+        self.scheduler.wake()
+
+    def _apply_conf(self, start_collector, stop_collector):
+        """Stop removed collectors, start added ones and reschedule."""
+        conf, self._new_conf = self._new_conf, None
+        removed = [
+            _collector for _collector in self.conf["collectors"]
+            if _collector not in conf["collectors"]
+        ]
+        added = [
+            _collector for _collector in conf["collectors"]
+            if _collector not in self.conf["collectors"]
+        ]
+
+        for _collector in removed:
+            stop_collector(_collector)
+
+        if conf["polling_interval"] <= 0:
+            conf["polling_interval"] = 0.1
+        self.conf = conf
+        for _collector in added:
+            start_collector(_collector)
+        self.scheduler.overrun = conf.get("overrun", DeadlineScheduler.SKIP)
+        self.scheduler.clear()
+        schedule_collectors(self.scheduler, self.conf)
+        self.logger.info(
+            "[%s]: Configuration reloaded (%d servers added, %d removed)",
+            self.name,
+            len(added),
+            len(removed)
+        )
 
-    def _interruptible_sleep(self, duration):
-        """Execute fragmeted sleep to be interruptible by signals."""
-        if duration > 0.1:
-            sleep_duration = 0.1
-        else:
-            sleep_duration = duration
-        spend_time = 0
-        while spend_time <= duration and self.running:
-            time.sleep(sleep_duration)
-            spend_time += sleep_duration
+    def _start_thread(self, collector):
+        """Start a collector thread."""
+        collector.condition = threading.Condition()
+        collector.start()
 
-    def run(self):
-        self.running = True
-        self.logger.debug(
-            "[%s]: Poller thread is starting!",
-            self.name
-        )
+    def _stop_thread(self, collector):
+        """Stop a collector thread and wait for it."""
+        collector.stop()
+        self._notity_collectors([collector])
+        collector.join()
 
+    def _run_threads(self):
+        """Run each collector in its own thread."""
         # Start all collect threads
         for _collector in self.conf["collectors"]:
-            _collector.condition = self.condition
-            _collector.start()
-
-        # Ensure colelctors are ready (i.e all pre_run executed)
-        # for _collector in self.conf["collectors"]:
-        #     while not _collector.ready:
-        #         time.sleep(0.1)
-        # self.logger.debug(
-        #     "[%s]: Server threads are ready, let's go!",
-        #     self.name
-        # )
+            self._start_thread(_collector)
 
         # Loop until stop was resquested
         self.logger.debug(
@@ -114,14 +202,18 @@ class Poller(Thread):
             self.name
         )
         # Give a chance to collectors to start
-        self._interruptible_sleep(0.5)
-
-        while self.running:
-            # Notfy Collector threads to get power
-            self._notity_collectors()
-
-            # Wait for polling interval
-            self._interruptible_sleep(self.conf["polling_interval"])
+        schedule_collectors(self.scheduler, self.conf, 0.5)
+
+        # Wait for next tick until stop was requested
+        collectors = self.scheduler.wait()
+        while collectors is not None:
+            if self._new_conf is not None:
+                self._apply_conf(self._start_thread, self._stop_thread)
+                collectors = []
+            # Trigger due Collector threads to get power (if not busy)
+            for _collector in collectors:
+                _collector.trigger()
+            collectors = self.scheduler.wait()
 
         self.logger.debug("[%s] Stoping collectors for poller", self.name)
         # Request stop for all collector threads
@@ -129,42 +221,167 @@ class Poller(Thread):
             _collector.stop()
 
         # Notify colelctors eventualy stuck on condition
-        self._notity_collectors()
+        self._notity_collectors(self.conf["collectors"])
 
         # Wait for collectors to stop
         self.logger.debug("[%s] Waiting for collectors to stop", self.name)
         for _collector in self.conf["collectors"]:
             _collector.join()
+
+    def _run_pool(self):
+        """Run collectors in a bounded pool of threads."""
+        self.logger.debug(
+            "[%s]: Starting %d workers for %d collectors",
+            self.name,
+            self.conf["workers"],
+            len(self.conf["collectors"])
+        )
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.conf["workers"],
+            thread_name_prefix=self.name
+        )
+        for _collector in self.conf["collectors"]:
+            self._start_pooled(_collector)
+
+        schedule_collectors(self.scheduler, self.conf)
+        collectors = self.scheduler.wait()
+        while collectors is not None:
+            if self._new_conf is not None:
+                self._apply_conf(self._start_pooled, self._stop_pooled)
+                collectors = []
+            for _collector in collectors:
+                if not self._futures[_collector].done():
+                    # Previous polling still running (slow equipement
+                    # or pool too small): skip this one
+                    _collector.skip_tick()
+                elif _collector.running:
+                    self._futures[_collector] = self._pool.submit(
+                        _collector.poll,
+                        True
+                    )
+            collectors = self.scheduler.wait()
+
+        self.logger.debug("[%s] Stoping collectors for poller", self.name)
+        for _collector in self.conf["collectors"]:
+            _collector.stop()
+
+        # Let running pollings complete before releasing collectors
+        self.logger.debug("[%s] Waiting for collectors to stop", self.name)
+        for _collector in self.conf["collectors"]:
+            self._futures.pop(_collector).result()
+            self._pool.submit(_collector.post_run)
+        self._pool.shutdown(wait=True)
+
+    def _start_pooled(self, collector):
+        """Initialize a collector in pool (ticks are skipped until done)."""
+        self._futures[collector] = self._pool.submit(collector.initialize)
+
+    def _stop_pooled(self, collector):
+        """Stop a pooled collector once its running polling is completed."""
+        collector.stop()
+        self._futures.pop(collector).result()
+        self._pool.submit(collector.post_run)
+
+    def run(self):
+        self.running = True
+        self.logger.debug(
+            "[%s]: Poller thread is starting!",
+            self.name
+        )
+
+        if self.conf.get("workers"):
+            self._run_pool()
+        else:
+            self._run_threads()
+
         self.logger.debug("[%s]: Poller stoped", self.name)
 
 
 # pylint: disable=locally-disabled, unused-argument
 def signal_term_handler(signal_received=signal.SIGTERM, frame=None):
     """Sigterm signal handler."""
+    if WORKERS:
+        # Supervisor: forward to workers processes
+        workers = list(WORKERS.values())
+        WORKERS.clear()
+        for worker in workers:
+            logging.info("Stopping worker process %s", worker.name)
+            worker.terminate()
+        logging.info("Waiting for workers to stop....")
+        for worker in workers:
+            worker.join()
     for running_thread in POLLERS:
         logging.info("Stopping threads for poller %s", running_thread.name)
         running_thread.stop()
     logging.info("Waiting for pollers to stop....")
     for running_thread in POLLERS:
         running_thread.join()
+    if ASYNC_ENGINE is not None:
+        ASYNC_ENGINE.stop()
+    # Send data queued by collectors
+    stop_uploaders()
     logging.info("Program terminated")
+    sys.exit(0)
 
 
 # pylint: disable=locally-disabled, unused-argument
 def signal_usr1_handler(signal_received, frame):
     """USR1 signal handler."""
+    for worker in WORKERS.values():
+        # Supervisor: forward to workers processes
+        if worker.is_alive():
+            os.kill(worker.pid, signal.SIGUSR1)
+    if WORKERS:
+        return
+
     logging.info("Running config is:")
     for poller in POLLERS:
         logging.info("\t[%s]", poller.name)
         for collector in poller.conf["collectors"]:
             logging.info(
-                "\t\t[%s] ready=%s running=%s",
+                "\t\t[%s] ready=%s running=%s stats=%s",
                 collector.name,
                 collector.ready,
-                collector.running
+                collector.running,
+                collector.stats.to_dict()
             )
 
 
+# pylint: disable=locally-disabled, unused-argument
+def signal_hup_handler(signal_received, frame):
+    """
+    HUP signal handler: request configuration reload.
+
+    Stopping collectors may be long: reload is run by main loop (see
+    reload_if_requested).
+    """
+    RELOAD.set()
+
+
+def reload_if_requested():
+    """Reload configuration if requested by SIGHUP."""
+    if not RELOAD.is_set():
+        return
+    RELOAD.clear()
+    for worker in WORKERS.values():
+        # Supervisor: forward to workers processes
+        if worker.is_alive():
+            os.kill(worker.pid, signal.SIGHUP)
+    if WORKERS:
+        # Restarted workers should use new configuration
+        config = load_config(reload=True)
+        if config is not None:
+            config["PROCESSES"] = CONFIG.get("PROCESSES", 1)
+            CONFIG.clear()
+            CONFIG.update(config)
+        return
+
+    try:
+        reload_pollers()
+    except Exception:  # pylint: disable=locally-disabled,broad-except
+        logging.exception("Error while reloading configuration")
+
+
 def get_collector(server, pod, config):
     """Get proper collector instance."""
 
@@ -242,6 +459,16 @@ def get_collector(server, pod, config):
             server_conf["temperature"] = server["temperature"]
         if "power" in server:
             server_conf["power"] = server["power"]
+        if "session_auth" in server:
+            server_conf["session_auth"] = server["session_auth"]
+        if "concurrency" in server:
+            server_conf["concurrency"] = server["concurrency"]
+        if "etag" in server:
+            server_conf["etag"] = server["etag"]
+        if "mode" in server:
+            server_conf["mode"] = server["mode"]
+        if "REDFISH_DISCOVERY" in config:
+            server_conf["discovery"] = config["REDFISH_DISCOVERY"]
 
         the_collector = RedfishCollector(
             pod["environment"],
@@ -351,96 +578,310 @@ def get_collector(server, pod, config):
     return the_collector
 
 
-def start_pollers():
-    """Load conf, parse it, create pollers and collectors and start them."""
+def load_config(reload=False):
+    """
+    Load yaml conf file.
 
-    # Load yaml conf file
+        :param reload: If True, return None on error instead of exiting
+        :type reload: bool
+    """
     with open("conf/collector-settings.yaml", 'r') as stream:
         try:
             config = yaml.safe_load(stream)
         except yaml.YAMLError:
             logging.exception("Error while loading config")
+            if reload:
+                return None
             sys.exit()
-
-    # Parse confir to create poller and collectors
-    for a_pod in config["PODS"]:
-        logging.info(
-            "Loading configuration for pod %s",
-            a_pod["environment"]
+    return config
+
+
+def get_shard(pod, server, shards):
+    """Get index of the worker process in charge of a server."""
+    key = "{}/{}".format(pod["environment"], server["id"])
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def get_engine_conf(config):
+    """Get polling engine settings: "threads" (default) or "asyncio"."""
+    engine_conf = {
+        "type": "threads",
+        "workers": 32
+    }
+    if "ENGINE" in config:
+        engine_conf.update(config["ENGINE"])
+    return engine_conf
+
+
+def get_collector_settings(server, pod, config):
+    """
+    Get settings a collector is created from (see get_collector).
+
+    Running collectors are reused on reload if these settings did not
+    change.
+    """
+    pod_settings = {
+        key: value
+        for key, value in pod.items()
+        if key not in POLLER_SETTINGS
+    }
+    return (server, pod_settings, config.get("REDFISH_DISCOVERY"))
+
+
+def get_poller_conf(a_pod, config, shard=0, shards=1, running=None):
+    """
+    Parse pod conf and create its collectors.
+
+        :param a_pod: Pod settings (item of PODS)
+        :type a_pod: dictionary
+
+        :param config: Collector settings
+        :type config: dictionary
+
+        :param shard: Index of current worker process
+        :type shard: int
+
+        :param shards: Number of worker processes (servers are distributed
+                       accross them, see get_shard)
+        :type shards: int
+
+        :param running: Running collectors by (environment, server id),
+                        reused if their settings did not change (see
+                        get_collector_settings)
+        :type running: dictionary
+
+        :return: Poller configuration, None if there is nothing to poll
+        :rtype: dictionary
+    """
+    if running is None:
+        running = {}
+    logging.info(
+        "Loading configuration for pod %s",
+        a_pod["environment"]
+    )
+
+    # Backward compatibility (defaut polling interval)
+    if "polling_interval" not in a_pod:
+        polling_interval = 10
+        logging.warning(
+            "\n\n*******************************\n\n"
+            "\"polling_interval\" is not set in PODS definition yaml file "
+            "(at environment level) using default setting: %ds "
+            "\n\n*******************************\n\n",
+            polling_interval
         )
+    else:
+        polling_interval = a_pod["polling_interval"]
 
-        # Backward compatibility (defaut polling interval)
-        if "polling_interval" not in a_pod:
-            polling_interval = 10
-            logging.warning(
-                "\n\n*******************************\n\n"
-                "\"polling_interval\" is not set in PODS definition yaml file "
-                "(at environment level) using default setting: %ds "
-                "\n\n*******************************\n\n",
-                polling_interval
-            )
-        else:
-            polling_interval = a_pod["polling_interval"]
-
-        # Current poller config data structure
-        poller_conf = {
-            "polling_interval": polling_interval,
-            "collectors": [],
-            "active": True,
-            "environment": a_pod["environment"]
-        }
+    # Current poller config data structure
+    poller_conf = {
+        "polling_interval": polling_interval,
+        "collectors": [],
+        "active": True,
+        "environment": a_pod["environment"]
+    }
 
-        if "active" in a_pod:
-            poller_conf["active"] = a_pod["active"]
-
-        if poller_conf["active"]:
-            # Create collectors for servers and add it to current poller
-            for srv in a_pod["servers"]:
-                if "active" not in srv or srv["active"]:
-                    collector = get_collector(
-                        srv,
-                        a_pod,
-                        config
-                    )
-                    poller_conf["collectors"].append(collector)
-                else:
-                    logging.info(
-                        "Server %s is not active: skipping",
-                        srv["id"]
-                    )
+    if "active" in a_pod:
+        poller_conf["active"] = a_pod["active"]
 
-            poller = Poller(poller_conf)
-            POLLERS.append(poller)
+    # Optional: spread servers pollings over polling interval
+    if "jitter" in a_pod:
+        poller_conf["jitter"] = a_pod["jitter"]
 
-            logging.info(
-                "Starting poller threads for pod %s",
-                a_pod["environment"]
-            )
-            poller.start()
+    # Optional: policy for late polling ticks (skip or catchup)
+    if "overrun" in a_pod:
+        poller_conf["overrun"] = a_pod["overrun"]
+
+    # Optional: bounded pool of threads instead of thread per server
+    if "workers" in a_pod:
+        poller_conf["workers"] = a_pod["workers"]
+
+    if not poller_conf["active"]:
+        logging.info(
+            "Environment %s is not active: skipping",
+            a_pod["environment"]
+        )
+        return None
+
+    # Create collectors for servers and add it to current poller
+    for srv in a_pod["servers"]:
+        if get_shard(a_pod, srv, shards) != shard:
+            # Polled by an other worker process
+            continue
+        if "active" not in srv or srv["active"]:
+            collector = running.get((a_pod["environment"], srv["id"]))
+            settings = get_collector_settings(srv, a_pod, config)
+            if collector is None or not collector.running or \
+                    collector.settings != settings:
+                collector = get_collector(
+                    srv,
+                    a_pod,
+                    config
+                )
+                collector.settings = settings
+                if "polling_interval" in srv:
+                    collector.polling_interval = srv["polling_interval"]
+            poller_conf["collectors"].append(collector)
         else:
             logging.info(
-                "Environment %s is not active: skipping",
-                a_pod["environment"]
+                "Server %s is not active: skipping",
+                srv["id"]
             )
 
+    if shards > 1 and not poller_conf["collectors"]:
+        logging.info(
+            "No server of %s to poll in this worker: skipping",
+            a_pod["environment"]
+        )
+        return None
+    return poller_conf
 
-def main():
-    """Execute main code."""
 
-    # Activate signal handler for SIGTERM
-    signal.signal(signal.SIGTERM, signal_term_handler)
-    signal.signal(signal.SIGUSR1, signal_usr1_handler)
+def start_poller(poller_conf, engine_conf):
+    """Create and start a poller."""
+    if engine_conf["type"] == "asyncio":
+        poller = AsyncPoller(poller_conf)
+        POLLERS.append(poller)
+        if ASYNC_ENGINE is not None:
+            ASYNC_ENGINE.add_poller(poller)
+    else:
+        poller = Poller(poller_conf)
+        POLLERS.append(poller)
 
-    # Configure logging
-    logging.config.fileConfig("conf/collector-logging.conf")
+        logging.info(
+            "Starting poller threads for pod %s",
+            poller_conf["environment"]
+        )
+        poller.start()
 
-    logging.info("Server power consumption daemon is starting")
 
-    start_pollers()
+def stop_poller(poller):
+    """Stop a poller and wait for it."""
+    logging.info("Stopping threads for poller %s", poller.name)
+    poller.stop()
+    poller.join()
+    POLLERS.remove(poller)
+
+
+def start_pollers(config, shard=0, shards=1):
+    """
+    Parse conf, create pollers and collectors and start them.
+
+        :param config: Collector settings
+        :type config: dictionary
+
+        :param shard: Index of current worker process
+        :type shard: int
+
+        :param shards: Number of worker processes (servers are distributed
+                       accross them, see get_shard)
+        :type shards: int
+    """
+    global ASYNC_ENGINE, SHARD  # pylint: disable=global-statement
+
+    SHARD = (shard, shards)
+    engine_conf = get_engine_conf(config)
+
+    # Parse confir to create poller and collectors
+    for a_pod in config["PODS"]:
+        poller_conf = get_poller_conf(a_pod, config, shard, shards)
+        if poller_conf is not None:
+            start_poller(poller_conf, engine_conf)
+
+    if engine_conf["type"] == "asyncio":
+        ASYNC_ENGINE = AsyncEngine(POLLERS, engine_conf["workers"])
+        ASYNC_ENGINE.start()
+
+
+def reload_pollers():
+    """
+    Reload conf file and apply changes to running pollers.
+
+    Only collectors of added or changed servers are (re)created, others
+    keep running with their state (ex. discovered sensors). Pollers of
+    added pods are started, those of removed or deactivated pods are
+    stopped.
+    """
+    config = load_config(reload=True)
+    if config is None:
+        logging.error("Configuration not reloaded, keeping running one")
+        return
+    logging.info("Reloading configuration")
+
+    # Process level settings can't be changed while running
+    for key in ("ENGINE", "PROCESSES", "METRICS"):
+        if config.get(key) != CONFIG.get(key):
+            logging.warning("%s changes are applied at restart only", key)
+        if key in CONFIG:
+            config[key] = CONFIG[key]
+        else:
+            config.pop(key, None)
+
+    running = {}
+    if config["RECORDER_API_SERVER"] == CONFIG["RECORDER_API_SERVER"]:
+        for poller in POLLERS:
+            for _collector in poller.conf["collectors"]:
+                running[(_collector.environment, _collector.server_id)] = \
+                    _collector
+    else:
+        logging.info("Recording API settings changed: restarting collectors")
+
+    shard, shards = SHARD
+    engine_conf = get_engine_conf(config)
+    pollers = {poller.conf["environment"]: poller for poller in POLLERS}
+    for a_pod in config["PODS"]:
+        poller = pollers.pop(a_pod["environment"], None)
+        if poller is not None and \
+                a_pod.get("workers") != poller.conf.get("workers"):
+            # Threads model changed: restart poller (and its collectors)
+            stop_poller(poller)
+            poller = None
+
+        poller_conf = get_poller_conf(a_pod, config, shard, shards, running)
+        if poller_conf is None:
+            if poller is not None:
+                stop_poller(poller)
+        elif poller is not None:
+            poller.reconfigure(poller_conf)
+        else:
+            start_poller(poller_conf, engine_conf)
+
+    # Removed pods
+    for poller in pollers.values():
+        stop_poller(poller)
+
+    CONFIG.clear()
+    CONFIG.update(config)
+
+
+def start_metrics(config, shard=0):
+    """
+    Start metrics endpoint (if enabled).
+
+    With several worker processes, each one listen on port + shard index.
+    """
+    metrics_conf = {
+        "enabled": False,
+        "bind": "0.0.0.0",
+        "port": 9200
+    }
+    if "METRICS" in config:
+        metrics_conf.update(config["METRICS"])
+    if not metrics_conf["enabled"]:
+        return
+    metrics_conf["port"] += shard
+    try:
+        MetricsServer(metrics_conf, POLLERS).start()
+    except OSError:
+        logging.exception("Unable to start metrics endpoint")
+
+
+def wait_for_termination():
+    """Wait until killed."""
     try:
-        # Wait until killed
         while True:
             time.sleep(1)
+            reload_if_requested()
     except KeyboardInterrupt:
         signal_term_handler()
     except SystemExit:
@@ -453,5 +894,100 @@ def main():
         signal_term_handler()
 
 
+def run_worker(config, shard, shards):
+    """Worker process main code."""
+    # Supervisor's workers are not ours
+    WORKERS.clear()
+    logging.info("Worker %d/%d is starting", shard + 1, shards)
+
+    start_metrics(config, shard)
+    start_pollers(config, shard, shards)
+    wait_for_termination()
+
+
+def start_worker(config, shard, shards):
+    """Start a worker process polling its shard of servers."""
+    worker = multiprocessing.get_context("fork").Process(
+        target=run_worker,
+        args=(config, shard, shards),
+        name="worker/{}".format(shard)
+    )
+    worker.start()
+    WORKERS[shard] = worker
+
+
+def run_supervisor(config, shards):
+    """Start workers processes and restart them if they die."""
+    logging.info("Starting %d worker processes", shards)
+    started = {}
+    delays = {}
+    restarts = {}
+    for shard in range(0, shards):
+        start_worker(config, shard, shards)
+        started[shard] = time.monotonic()
+
+    try:
+        while True:
+            time.sleep(1)
+            reload_if_requested()
+            now = time.monotonic()
+            for shard, worker in list(WORKERS.items()):
+                if worker.is_alive() or shard not in WORKERS:
+                    continue
+                if shard not in restarts:
+                    if now - started[shard] > MAX_RESTART_DELAY:
+                        delays[shard] = RESTART_DELAY
+                    else:
+                        delays[shard] = min(
+                            delays.get(shard, RESTART_DELAY / 2) * 2,
+                            MAX_RESTART_DELAY
+                        )
+                    restarts[shard] = now + delays[shard]
+                    if worker.exitcode is not None and worker.exitcode < 0:
+                        status = "killed by signal {}".format(
+                            -worker.exitcode
+                        )
+                    else:
+                        status = "exit code {}".format(worker.exitcode)
+                    logging.warning(
+                        "Worker process %s died (%s): restarting in %ds",
+                        worker.name,
+                        status,
+                        delays[shard]
+                    )
+                if now >= restarts[shard]:
+                    del restarts[shard]
+                    start_worker(config, shard, shards)
+                    started[shard] = now
+    except KeyboardInterrupt:
+        signal_term_handler()
+    except SystemExit:
+        pass
+
+
+def main():
+    """Execute main code."""
+
+    # Activate signal handler for SIGTERM
+    signal.signal(signal.SIGTERM, signal_term_handler)
+    signal.signal(signal.SIGUSR1, signal_usr1_handler)
+    signal.signal(signal.SIGHUP, signal_hup_handler)
+
+    # Configure logging
+    logging.config.fileConfig("conf/collector-logging.conf")
+
+    logging.info("Server power consumption daemon is starting")
+
+    CONFIG.update(load_config())
+    # Optional: distribute servers accross several processes
+    processes = CONFIG.get("PROCESSES", 1)
+    if processes > 1:
+        run_supervisor(CONFIG, processes)
+    else:
+        start_metrics(CONFIG)
+        start_pollers(CONFIG)
+        wait_for_termination()
+
+
 if __name__ == "__main__":
     main()
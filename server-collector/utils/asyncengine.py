@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------
+# Module Name : terraHouat  power recording daemon
+# Version : 1.0
+#
+# Copyright © 2026 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# File Name   : asyncengine.py
+#
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     asyncio polling engine
+# -------------------------------------------------------
+# History     :
+# 1.0.0 - 2026-10-18 : Release of the file
+# 1.1.0 - 2026-10-18 : Schedule polling with drift-free deadlines
+# 1.2.0 - 2026-10-18 : Add servers polling intervals and jitter
+# 1.3.0 - 2026-10-18 : Record skipped ticks in collectors counters
+# 1.4.0 - 2026-10-18 : Apply configuration changes to running pollers
+#
+
+"""Drive all pollers from a single asyncio event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+from threading import Thread
+
+from utils.scheduler import DeadlineScheduler, PollingScheduler
+from utils.scheduler import schedule_collectors
+
+
+class AsyncPoller():
+    """Execute synchronized polling on a set of collectors (asyncio)."""
+
+    def __init__(self, conf):
+        """Initialize poller."""
+        self.logger = logging.getLogger(__name__)
+        self.conf = conf
+        self.running = False
+        self.name = "poller/{}".format(conf["environment"])
+        if self.conf["polling_interval"] <= 0:
+            self.conf["polling_interval"] = 0.1
+        self.scheduler = PollingScheduler(
+            self.name,
+            self.conf.get("overrun", DeadlineScheduler.SKIP)
+        )
+        self._stopped = threading.Event()
+        self._event_loop = None
+        self._wakeup = None
+        self._new_conf = None
+
+    def stop(self):
+        """Request poller stop."""
+        self.running = False
+        self.scheduler.stop()
+        if self._event_loop is not None:
+            # Wake up poller waiting for next tick
+            self._event_loop.call_soon_threadsafe(self._wakeup.set)
+        # Also interrupt collectors which may be running pre_run
+        for _collector in self.conf["collectors"]:
+            _collector.stop()
+
+    def reconfigure(self, conf):
+        """
+        Request poller to apply a new configuration.
+
+        Collectors which are not in the new configuration are stopped, new
+        ones are initialized and started, others keep running.
+
+            :param conf: New poller configuration (see daemon.start_pollers)
+            :type conf: dictionary
+        """
+        self._new_conf = conf
+        if self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._wakeup.set)
+
+    def join(self, timeout=None):
+        """Wait for poller to stop."""
+        self._stopped.wait(timeout)
+
+    def is_alive(self):
+        """Return True until poller is stopped."""
+        return not self._stopped.is_set()
+
+    async def _wait_tick(self):
+        """
+        Wait for next polling tick.
+
+        Return collectors to poll (may be empty if woken up before next
+        tick), or None if poller was stopped while waiting.
+        """
+        try:
+            await asyncio.wait_for(
+                self._wakeup.wait(),
+                self.scheduler.delay()
+            )
+        except asyncio.TimeoutError:
+            pass
+        if self.scheduler.stopped():
+            return None
+        self._wakeup.clear()
+        return self.scheduler.pop_due()
+
+    async def _poll(self, collector):
+        """Collect and post data for a collector."""
+        try:
+            data = await collector.collect_async()
+            if data:
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    collector.post,
+                    data,
+                    True
+                )
+        except Exception:  # pylint: disable=broad-except
+            collector.handle_error()
+
+    async def run(self):
+        """Poller main coroutine."""
+        self.running = True
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._event_loop = loop
+        self.logger.debug(
+            "[%s]: Poller is starting!",
+            self.name
+        )
+
+        tasks = {}
+        try:
+            await asyncio.gather(*[
+                loop.run_in_executor(None, _collector.initialize)
+                for _collector in self.conf["collectors"]
+            ])
+            self.logger.debug(
+                "[%s]: Collectors are initialized, entering polling loop!",
+                self.name
+            )
+            await self._loop(tasks)
+        finally:
+            self.logger.debug("[%s] Stoping collectors for poller", self.name)
+            for _collector in self.conf["collectors"]:
+                _collector.stop()
+            await asyncio.gather(*tasks.values())
+            await asyncio.gather(*[
+                loop.run_in_executor(None, _collector.post_run)
+                for _collector in self.conf["collectors"]
+            ])
+            self.logger.debug("[%s]: Poller stoped", self.name)
+            self._stopped.set()
+
+    async def _loop(self, tasks):
+        """Polling loop."""
+        loop = asyncio.get_running_loop()
+        schedule_collectors(self.scheduler, self.conf)
+        collectors = await self._wait_tick()
+        while collectors is not None:
+            if self._new_conf is not None:
+                await self._apply_conf(tasks)
+                collectors = []
+            for _collector in collectors:
+                if not _collector.running:
+                    continue
+                task = tasks.get(_collector.name)
+                if task is not None and not task.done():
+                    _collector.skip_tick()
+                    continue
+                tasks[_collector.name] = loop.create_task(
+                    self._poll(_collector)
+                )
+            collectors = await self._wait_tick()
+
+    async def _apply_conf(self, tasks):
+        """Stop removed collectors, start added ones and reschedule."""
+        loop = asyncio.get_running_loop()
+        conf, self._new_conf = self._new_conf, None
+        removed = [
+            _collector for _collector in self.conf["collectors"]
+            if _collector not in conf["collectors"]
+        ]
+        added = [
+            _collector for _collector in conf["collectors"]
+            if _collector not in self.conf["collectors"]
+        ]
+
+        for _collector in removed:
+            _collector.stop()
+            task = tasks.pop(_collector.name, None)
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+            await loop.run_in_executor(None, _collector.post_run)
+
+        if conf["polling_interval"] <= 0:
+            conf["polling_interval"] = 0.1
+        self.conf = conf
+        for _collector in added:
+            # Ticks are skipped until initialization is completed
+            tasks[_collector.name] = loop.run_in_executor(
+                None,
+                _collector.initialize
+            )
+        self.scheduler.overrun = conf.get("overrun", DeadlineScheduler.SKIP)
+        self.scheduler.clear()
+        schedule_collectors(self.scheduler, self.conf)
+        self.logger.info(
+            "[%s]: Configuration reloaded (%d servers added, %d removed)",
+            self.name,
+            len(added),
+            len(removed)
+        )
+
+
+class AsyncEngine(Thread):
+    """Run pollers in a single asyncio event loop."""
+
+    def __init__(self, pollers, workers):
+        """
+        Initialize engine thread.
+
+            :param pollers: pollers to run
+            :type pollers: list of AsyncPoller
+
+            :param workers: Max. number of threads used to run blocking
+                            collectors code
+            :type workers: int
+        """
+        Thread.__init__(self)
+        self.logger = logging.getLogger(__name__)
+        self.name = "asyncio-engine"
+        # Pollers added later are not in this list (see add_poller)
+        self.pollers = list(pollers)
+        self.workers = workers
+        self._event_loop = None
+        self._done = None
+        self._tasks = []
+        self._started = threading.Event()
+
+    async def _main(self):
+        """Engine main coroutine."""
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="collect"
+        )
+        self._event_loop = asyncio.get_running_loop()
+        self._event_loop.set_default_executor(executor)
+        self._done = asyncio.Event()
+        for poller in self.pollers:
+            self._start_poller(poller)
+        self._started.set()
+
+        # Run until stop is requested, then wait for pollers
+        await self._done.wait()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _start_poller(self, poller):
+        """Run a poller in event loop."""
+        self._tasks.append(self._event_loop.create_task(poller.run()))
+
+    def add_poller(self, poller):
+        """
+        Run a new poller in engine (may be called from other threads).
+
+            :param poller: poller to run
+            :type poller: AsyncPoller
+        """
+        self._started.wait()
+        self._event_loop.call_soon_threadsafe(self._start_poller, poller)
+
+    def stop(self):
+        """Request engine stop (once pollers are stopped)."""
+        self._started.wait()
+        self._event_loop.call_soon_threadsafe(self._done.set)
+
+    def run(self):
+        """Thread main code."""
+        self.logger.info(
+            "asyncio engine is starting with %d pollers",
+            len(self.pollers)
+        )
+        asyncio.run(self._main())
+        self.logger.info("asyncio engine stoped")
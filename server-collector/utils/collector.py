@@ -21,10 +21,18 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2018-10-30 : Release of the file
+# 1.1.0 - 2026-10-18 : Share polling code in BaseCollector, add asyncio support
+# 1.2.0 - 2026-10-18 : Skip ticks while collector is busy, add counters
+# 1.3.0 - 2026-10-18 : Nano sec. measurements time (request midpoint)
+# 1.4.0 - 2026-10-18 : Add batching uploader support
+# 1.5.0 - 2026-10-18 : Add latency histograms and data counters for metrics
+# 1.6.0 - 2026-10-18 : Keep server settings to detect changes on reload
+# 1.7.0 - 2026-10-18 : Record posting stats with batching uploader
 #
 
 """Collect power comsumption base class."""
 
+import asyncio
 import logging.config
 import sys
 import threading
@@ -35,16 +43,121 @@ import traceback
 import requests
 
 from utils.common import SensorsPoster
+from utils.uploader import get_uploader, uploader_enabled
 
 requests.packages.urllib3.disable_warnings()  # pylint: disable=no-member
 
 
-class Collector(Thread):
-    """Collect power consumption via HP Redfish rest/redfish API."""
+class Latency():
+    """Duration counters and histogram."""
+
+    # Histogram buckets upper bounds (in sec.)
+    BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self):
+        """Initialize counters."""
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.last = 0
+        # Cumulative count of durations lower or equal to each bound
+        self.buckets = [0] * len(self.BUCKETS)
+
+    def add(self, duration):
+        """Record a duration (in sec.)."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        if duration > self.max:
+            self.max = duration
+        for idx, bound in enumerate(self.BUCKETS):
+            if duration <= bound:
+                self.buckets[idx] += 1
+
+    def to_dict(self):
+        """Get counters as a dictionary."""
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "last": self.last
+        }
+
+
+class CollectorStats():
+    """Collector polling counters."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.lock = threading.Lock()
+        self.overruns = 0
+        self.errors = 0
+        self.measurements = 0
+        self.last_measurements = 0
+        self.bytes_sent = 0
+        # Data posts in progress (batching uploader)
+        self.posting = 0
+        self.poll_latency = Latency()
+        self.post_latency = Latency()
+
+    def add_overrun(self):
+        """Record a tick skipped because collector was busy."""
+        with self.lock:
+            self.overruns += 1
+
+    def add_error(self):
+        """Record a polling error."""
+        with self.lock:
+            self.errors += 1
+
+    def add_poll(self, duration):
+        """Record equipement reading duration (in sec.)."""
+        with self.lock:
+            self.poll_latency.add(duration)
+
+    def add_measurements(self, nb_measurements):
+        """Record number of measurements read at a polling."""
+        with self.lock:
+            self.measurements += nb_measurements
+            self.last_measurements = nb_measurements
+
+    def add_post(self, duration, nb_bytes=0):
+        """Record data posting duration (in sec.) and size (in bytes)."""
+        with self.lock:
+            self.post_latency.add(duration)
+            self.bytes_sent += nb_bytes
+
+    def start_post(self):
+        """Record start of a data post run by batching uploader."""
+        with self.lock:
+            self.posting += 1
+
+    def end_post(self, duration, nb_bytes=0):
+        """Record end of a data post run by batching uploader."""
+        with self.lock:
+            self.posting -= 1
+            self.post_latency.add(duration)
+            self.bytes_sent += nb_bytes
+
+    def to_dict(self):
+        """Get counters as a dictionary."""
+        with self.lock:
+            return {
+                "overruns": self.overruns,
+                "errors": self.errors,
+                "measurements": self.measurements,
+                "bytes_sent": self.bytes_sent,
+                "poll_latency": self.poll_latency.to_dict(),
+                "post_latency": self.post_latency.to_dict()
+            }
+
+
+class BaseCollector(Thread):
+    """Collectors root class: polling loop and data publishing."""
 
     type = "to-be-overloaded-at-implem"
 
-    # Should be replaced by daemon condition at implem class creation
+    # Should be replaced by poller condition at implem class creation
     condition = threading.Condition()
 
     def __init__(self,
@@ -53,7 +166,7 @@ class Collector(Thread):
                  server_conf,
                  data_server_conf):
         """
-        Constructor: create an instance of IPMICollector class.
+        Constructor: create an instance of BaseCollector class.
 
             :param environment: Environment on witch power is collected
             :type environment: string
@@ -61,14 +174,9 @@ class Collector(Thread):
             :param server_id: Server identifier
             :type server_id: string
 
-            :param server_conf: Dictionnatry containing Redfish API
-                                    connectivity settings
-            :type server_base_url: dictionary
-            {
-                "base_url": "Redfish API base URL. Ex.: https://localhost:443",
-                "user": Basic authentication user,
-                "pass": Basic authentication password,
-            }
+            :param server_conf: Dictionnatry containing child implem params
+                Ex: Connectivity setting to server, sensors to collect....
+            :type server_conf: dictionary
 
             :param data_server_conf: recorder API connection params
             :type data_server_conf dictionarydictionary
@@ -94,8 +202,18 @@ class Collector(Thread):
         self.data_server_conf = data_server_conf
         self.running = False
         self.ready = False
+        # Server specific polling interval (default is pod one)
+        self.polling_interval = None
+        # Server settings the collector was created from (see reload)
+        self.settings = None
         self.log = logging.getLogger(__name__)
+
         self.data_poster = None
+        self._on_send_ok = {}
+
+        self.stats = CollectorStats()
+        self._polling = False
+        self._triggered = False
 
     def stop(self):
         """
@@ -111,10 +229,33 @@ class Collector(Thread):
         self.running = False
         self.ready = False
 
-    def get_power(self):
-        """Get Power from box (to be implemented)."""
-        raise Exception("get_power must be implmented")
-        return 0  # pylint: disable=unreachable
+    def busy(self):
+        """Return True if a polling or a data post is running."""
+        return self._polling or self.stats.posting > 0 or (
+            self.data_poster is not None and self.data_poster.is_alive()
+        )
+
+    def skip_tick(self):
+        """Record a tick skipped because collector is still busy."""
+        self.stats.add_overrun()
+        self.log.warning(
+            "[%s]: previous polling still running: skipping",
+            self.name
+        )
+
+    def trigger(self):
+        """
+        Request a polling to collector thread.
+
+        Return False if tick is skipped because collector is busy.
+        """
+        with self.condition:
+            if self.busy():
+                self.skip_tick()
+                return False
+            self._triggered = True
+            self.condition.notify_all()
+        return True
 
     def pre_run(self):
         """Execute code before thread starts."""
@@ -124,11 +265,18 @@ class Collector(Thread):
         """Execute code when stread stops."""
         return True
 
-    def run(self):
-        """Thread main code."""
+    def on_send_ok(self, func, *args):
+        """
+            Register function (with args) to trigger on successfull data send.
+        """
+
+        self._on_send_ok["func"] = func
+        self._on_send_ok["args"] = args
 
+    def initialize(self):
+        """Mark collector as running and execute pre_run."""
         self.log.info(
-            "[%s]: Starting collector thread",
+            "[%s]: Starting collector",
             self.name
         )
 
@@ -139,209 +287,203 @@ class Collector(Thread):
         except Exception:  # pylint: disable=locally-disabled,broad-except
             self.log.exception(
                 "[%s]: Error while executing pre_run. "
-                "\n\n\tSTOPING THREAD !!\n\n",
+                "\n\n\tSTOPING COLLECTOR !!\n\n",
                 self.name
             )
             self.running = False
-        # Iterate for ever, or near....
-        while self.running:
-
-            # Wait for next request
-            self.log.debug(
-                "[%s]: Collector ready for next read",
-                self.name
-            )
-            self.condition.acquire()
-            self.condition.wait()
-            self.condition.release()
-            # Ensure previously posted data are send
-            if self.data_poster is not None:
-                self.data_poster.join()
-
-            # Running status may have changed while waitting
-            if self.running:
-                try:
-                    # Get measurement time in nano sec.
-                    data_time = int(time.time()) * 1000000000
-                    self.log.debug(
-                        "[%s]: collect time is %d",
-                        self.name,
-                        data_time
-                    )
-                    power = self.get_power()
-                    self.log.debug(
-                        "[%s]: POWER=%s",
-                        self.name,
-                        str(power)
-                    )
-                    if power is not None and power != 0:
-                        data = {
-                            "environment": self.environment,
-                            "sender": self.server_id,
-                            "measurements": [
-                                {
-                                    "sensor": "power",
-                                    "unit": "W",
-                                    "value": power
-                                }
-                            ],
-                            "data_time": data_time
-                        }
-                        self.log.debug(
-                            "[%s]: %s",
-                            self.name,
-                            data
-                        )
-
-                        self.data_poster = SensorsPoster(
-                            data,
-                            self.data_server_conf
-                        )
-                        self.data_poster.name = self.name + "/DataPoster"
-                        self.data_poster.start()
-
-                    else:
-                        self.log.info(
-                            "[%s]: Didn't got power from server",
-                            self.name,
-                        )
-                except Exception:  # pylint: disable=broad-except
-                    # No: default case
-                    self.log.error(
-                        "[%s]: Error while trying to connect server "
-                        "for power query: %s",
-                        self.name,
-                        sys.exc_info()[0]
-                    )
-                    self.log.debug(traceback.format_exc())
 
-        self.post_run()
-        self.log.debug(
-            "[%s]: Thread for server is teminated",
-            self.name
-        )
-
-
-class SensorsCollector(Thread):
-    """Collect Sensors value collect/publish root class."""
+    def read(self):
+        """Read measurements from equipement (to be implemented)."""
+        raise Exception("read must be implmented")
+        return []  # pylint: disable=unreachable
 
-    type = "to-be-overloaded-at-implem"
+    def read_async(self):
+        """
+        Get a coroutine reading measurements from equipement.
 
-    # Should be replaced by daemon condition at implem class creation
-    condition = threading.Condition()
+        To be overloaded by collectors natively supporting asyncio,
+        return None if not supported.
+        """
+        return None
 
-    def __init__(self,
-                 environment,
-                 server_id,
-                 server_conf,
-                 data_server_conf):
+    def build_data(self, measurements, data_time):
         """
-        Constructor: create an instance of SensorsCollector class.
+        Build data to post from read measurements.
 
-            :param environment: Environment on witch power is collected
-            :type environment: string
+        Return None if there is nothing to post.
+            :param measurements: Read measurements
+            :type measurements: list
 
-            :param server_id: Server identifier
-            :type server_id: string
+            :param data_time: Acquisition time (in ns), used for
+                              measurements without time
+            :type data_time: int
+        """
+        self.log.debug(
+            "[%s]: MEASUREMENT=%s",
+            self.name,
+            measurements
+        )
+        self.stats.add_measurements(len(measurements or []))
+        if not measurements:
+            if "func" in self._on_send_ok:
+                self._on_send_ok["func"](
+                    *self._on_send_ok["args"]
+                )
+            self.log.info(
+                "[%s]: Didn't got any measurement from equipement",
+                self.name,
+            )
+            return None
 
-            :param server_conf: Dictionnatry containing child implem params
-                Ex: Connectivity setting to server, sensors to collect....
-            :type server_conf: dictionary
+        for meas in measurements:
+            if "time" not in meas or meas["time"] == 0:
+                meas["time"] = data_time
 
-            :param data_server_conf: recorder API connection params
-            :type data_server_conf dictionarydictionary
-            {
-                "base_url": "Recorder API base URL",
-                "user": Basic authentication user,
-                "pass": Basic authentication password
-            }
+        data = {
+            "environment": self.environment,
+            "sender": self.server_id,
+            "measurements": measurements,
+            "data_time": data_time
+        }
+        self.log.debug(
+            "[%s]: %s",
+            self.name,
+            data
+        )
+        return data
 
+    def _acquired(self, start_time, start):
         """
-        Thread.__init__(self)
-        self.server_id = server_id
-        self.name = "{}/{}".format(self.type, server_id)
-        self.server_conf = server_conf
-        self.environment = environment
-        if "user" in server_conf and\
-           server_conf["user"] != "" and\
-           server_conf["pass"] != "":
-            self.pod_auth = (
-                server_conf["user"], server_conf["pass"])
-        else:
-            self.pod_auth = None
-        self.data_server_conf = data_server_conf
-        self.running = False
-        self.ready = False
-        self.log = logging.getLogger(__name__)
+        Record reading duration and get acquisition time.
 
-        self.data_poster = None
-        self._on_send_ok = {}
+        Acquisition time (in ns) is the midpoint of equipement reading.
+            :param start_time: Reading start wall clock time (in ns)
+            :type start_time: int
 
-    def stop(self):
-        """
-        Stop running Thread.
-
-        Request to the current thread to stop by the end
-        of current loop iteration
+            :param start: Reading start monotonic time (in ns)
+            :type start: int
         """
+        duration = time.monotonic_ns() - start
+        self.stats.add_poll(duration / 1000000000)
         self.log.debug(
-            "[%s]: Stop called for server",
-            self.name
+            "[%s]: collect processing time is %d ms",
+            self.name,
+            duration // 1000000
         )
-        self.running = False
-        self.ready = False
+        return start_time + duration // 2
+
+    def collect(self):
+        """Read measurements from equipement and build data to post."""
+        # Get measurement time in nano sec.
+        start_time = time.time_ns()
+        start = time.monotonic_ns()
+        measurements = self.read()
+        data_time = self._acquired(start_time, start)
+        return self.build_data(measurements, data_time)
+
+    async def collect_async(self):
+        """
+        Collect data from an asyncio event loop.
 
-    def generate_sensor_data(self, sensor, unit, value, timestamp=None):
-        """Generate a dict to add to get_sensors result."""
-        res = {
-            "sensor": sensor,
-            "unit": unit,
-            "value": value
-        }
-        if timestamp:
-            res["time"] = timestamp
-        return res
+        Use collector coroutine if implemented, else run collect in
+        loop executor.
+        """
+        read_coroutine = self.read_async()
+        if read_coroutine is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.collect
+            )
 
-    def get_sensors(self):
-        """Get sensors values from equipement (to be implemented)."""
-        raise Exception("get_sensors must be implmented")
-        return []  # pylint: disable=unreachable
+        start_time = time.time_ns()
+        start = time.monotonic_ns()
+        measurements = await read_coroutine
+        data_time = self._acquired(start_time, start)
+        return self.build_data(measurements, data_time)
 
-    def pre_run(self):
-        """Execute code before thread starts."""
-        return True
+    def post(self, data, wait=False):
+        """
+        Post data to recording API.
 
-    def post_run(self):
-        """Execute code when stread stops."""
-        return True
+            :param data: Data to post (see build_data)
+            :type data: dictionary
 
-    def on_send_ok(self, func, *args):
+            :param wait: if True, post in calling thread, else in a
+                         dedicated thread (ignored when uploader is
+                         enabled: data are queued to uploader)
+            :type wait: bool
         """
-            Register function (with args) to trigger on successfull data send.
-        """
-
-        self._on_send_ok["func"] = func
-        self._on_send_ok["args"] = args
+        if uploader_enabled(self.data_server_conf):
+            on_send_ok = None
+            if "func" in self._on_send_ok:
+                on_send_ok = (
+                    self._on_send_ok["func"],
+                    self._on_send_ok["args"]
+                )
+            get_uploader(self.data_server_conf).submit(
+                data,
+                on_send_ok,
+                self.stats
+            )
+            return
 
-    def run(self):
-        """Thread main code."""
+        data_poster = SensorsPoster(
+            data,
+            self.data_server_conf
+        )
+        if "func" in self._on_send_ok:
+            data_poster.on_send_ok(
+                self._on_send_ok["func"],
+                *self._on_send_ok["args"]
+            )
+        data_poster.name = self.name + "/DataPoster"
+        if wait:
+            self._send(data_poster)
+        else:
+            self.data_poster = Thread(
+                target=self._send,
+                args=(data_poster,),
+                name=data_poster.name
+            )
+            self.data_poster.start()
+
+    def _send(self, data_poster):
+        """Run data poster and record its duration."""
+        start = time.monotonic()
+        data_poster.run()
+        self.stats.add_post(
+            time.monotonic() - start,
+            data_poster.bytes_sent
+        )
 
-        self.log.info(
-            "[%s]: Starting collector thread",
-            self.name
+    def handle_error(self):
+        """Log error raised while collecting data."""
+        self.stats.add_error()
+        self.log.error(
+            "[%s]: Error while trying to connect equipement "
+            "for sensors query: %s",
+            self.name,
+            sys.exc_info()[0]
         )
+        self.log.debug(traceback.format_exc())
 
-        self.running = True
+    def poll(self, wait=False):
+        """Collect and post data (see post for wait)."""
+        self._polling = True
         try:
-            self.pre_run()
-            self.ready = True
-        except Exception:  # pylint: disable=locally-disabled,broad-except
-            self.log.exception(
-                "[%s]: Error while executing pre_run. "
-                "\n\n\tSTOPING THREAD !!\n\n",
-                self.name
-            )
-            self.running = False
+            data = self.collect()
+            if data:
+                self.post(data, wait)
+        except Exception:  # pylint: disable=broad-except
+            # No: default case
+            self.handle_error()
+        finally:
+            self._polling = False
+
+    def run(self):
+        """Thread main code."""
+
+        self.initialize()
         # Iterate for ever, or near....
         while self.running:
 
@@ -350,85 +492,101 @@ class SensorsCollector(Thread):
                 "[%s]: Collector ready for next read",
                 self.name
             )
-            self.condition.acquire()
-            self.condition.wait()
-            self.condition.release()
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self._triggered or not self.running
+                )
+                self._triggered = False
+                # Busy until polling completes (see trigger)
+                self._polling = self.running
             # Ensure previously posted data are send
             if self.data_poster is not None:
                 self.data_poster.join()
 
             # Running status may have changed while waitting
             if self.running:
-                try:
-                    # Get measurement time in nano sec.
-                    data_time = int(time.time()) * 1000000000
-                    self.log.debug(
-                        "[%s]: collect time is %d",
-                        self.name,
-                        data_time
-                    )
-                    measurements = self.get_sensors()
-                    self.log.debug(
-                        "[%s]: collect processing time is %d ms",
-                        self.name,
-                        (int(time.time())*1000000000 - data_time)//1000000
-                    )
-                    self.log.debug(
-                        "[%s]: MEASUREMENT=%s",
-                        self.name,
-                        measurements
-                    )
-                    if measurements:
-
-                        for meas in measurements:
-                            if "time" not in meas or meas["time"] == 0:
-                                meas["time"] = int(time.time()) * 1000000000
-
-                        data = {
-                            "environment": self.environment,
-                            "sender": self.server_id,
-                            "measurements": measurements,
-                            "data_time": data_time
-                        }
-                        self.log.debug(
-                            "[%s]: %s",
-                            self.name,
-                            data
-                        )
-
-                        self.data_poster = SensorsPoster(
-                            data,
-                            self.data_server_conf
-                        )
-                        if "func" in self._on_send_ok:
-                            self.data_poster.on_send_ok(
-                                self._on_send_ok["func"],
-                                *self._on_send_ok["args"]
-                            )
-
-                        self.data_poster.name = self.name + "/DataPoster"
-                        self.data_poster.start()
-                    else:
-                        if "func" in self._on_send_ok:
-                            self._on_send_ok["func"](
-                                *self._on_send_ok["args"]
-                            )
-                        self.log.info(
-                            "[%s]: Didn't got any measurement from equipement",
-                            self.name,
-                        )
-                except Exception:  # pylint: disable=broad-except
-                    # No: default case
-                    self.log.error(
-                        "[%s]: Error while trying to connect equipement "
-                        "for sensors query: %s",
-                        self.name,
-                        sys.exc_info()[0]
-                    )
-                    self.log.debug(traceback.format_exc())
+                self.poll()
 
         self.post_run()
         self.log.debug(
             "[%s]: Thread for equipement is teminated",
             self.name
         )
+
+
+class Collector(BaseCollector):
+    """Collect power consumption root class."""
+
+    def get_power(self):
+        """Get Power from box (to be implemented)."""
+        raise Exception("get_power must be implmented")
+        return 0  # pylint: disable=unreachable
+
+    # Collectors natively supporting asyncio may implement:
+    # async def get_power_async(self)
+    get_power_async = None
+
+    def _to_measurements(self, power):
+        """Convert read power to measurements list."""
+        self.log.debug(
+            "[%s]: POWER=%s",
+            self.name,
+            str(power)
+        )
+        if power is not None and power != 0:
+            return [
+                {
+                    "sensor": "power",
+                    "unit": "W",
+                    "value": power
+                }
+            ]
+        return []
+
+    def read(self):
+        """Read power from equipement."""
+        return self._to_measurements(self.get_power())
+
+    async def _read_power_async(self):
+        """Read power from equipement with collector coroutine."""
+        return self._to_measurements(await self.get_power_async())
+
+    def read_async(self):
+        """Get a coroutine reading power (if supported)."""
+        if self.get_power_async is None:
+            return None
+        return self._read_power_async()
+
+
+class SensorsCollector(BaseCollector):
+    """Collect Sensors value collect/publish root class."""
+
+    def generate_sensor_data(self, sensor, unit, value, timestamp=None):
+        """Generate a dict to add to get_sensors result."""
+        res = {
+            "sensor": sensor,
+            "unit": unit,
+            "value": value
+        }
+        if timestamp:
+            res["time"] = timestamp
+        return res
+
+    def get_sensors(self):
+        """Get sensors values from equipement (to be implemented)."""
+        raise Exception("get_sensors must be implmented")
+        return []  # pylint: disable=unreachable
+
+    # Collectors natively supporting asyncio may implement:
+    # async def get_sensors_async(self)
+    get_sensors_async = None
+
+    def read(self):
+        """Read sensors from equipement."""
+        return self.get_sensors()
+
+    def read_async(self):
+        """Get a coroutine reading sensors (if supported)."""
+        if self.get_sensors_async is None:
+            return None
+        return self.get_sensors_async()
@@ -22,14 +22,22 @@
 # -------------------------------------------------------
 # History     :
 # 1.0.0 - 2017-02-20 : Release of the file
+# 1.1.0 - 2026-10-18 : Spool sensors data recording API can't receive
+# 1.2.0 - 2026-10-18 : Count bytes sent by SensorsPoster
+# 1.2.1 - 2026-10-18 : Only spool measurements of failed chunks
 ##
 
 from threading import Thread
+import gzip
 import logging.config
 import json
 import urllib
+
+import msgpack
 import requests
 
+from utils.uploader import get_uploader, spool_enabled
+
 
 class PowerPoster(Thread):
     """Post power data to recorder API."""
@@ -152,6 +160,9 @@ class SensorsPoster(Thread):
                 "user": Basic authentication user,
                 "pass": Basic authentication password
                 "proxy": optional, proxy to use to connect recording apy
+                "format": optional, "json" (default) or "msgpack"
+                "compress": optional, gzip request bodies (default False)
+                "spool": optional, on disk spool settings (see Uploader)
             }
 
         """
@@ -161,6 +172,31 @@ class SensorsPoster(Thread):
         self.data_server = data_server
         self._on_send_ok = {}
         self._chunk_len = 10000
+        self.bytes_sent = 0
+
+    @staticmethod
+    def _pack(chunk_payload):
+        """Encode payload as columnar MessagePack."""
+        sensors = {}
+        index = []
+        values = []
+        times = []
+        for measurement in chunk_payload["measurements"]:
+            key = (measurement["sensor"], measurement["unit"])
+            if key not in sensors:
+                sensors[key] = len(sensors)
+            index.append(sensors[key])
+            values.append(measurement["value"])
+            times.append(measurement.get("time", 0))
+
+        return msgpack.packb({
+            "environment": chunk_payload["environment"],
+            "time": chunk_payload["time"],
+            "sensors": [list(key) for key in sensors],
+            "index": index,
+            "values": values,
+            "times": times
+        })
 
     def on_send_ok(self, func, *args):
         """
@@ -177,6 +213,8 @@ class SensorsPoster(Thread):
         payload = {'measurements': self.data["measurements"],
                    'time': self.data["data_time"],
                    'environment': self.data["environment"]}
+        # Measurements before sent_idx are acknowledged
+        sent_idx = 0
         try:
             if self.data_server["user"] != "" and\
                self.data_server["pass"] != "":
@@ -208,6 +246,17 @@ class SensorsPoster(Thread):
             api_uri = self.data_server["base_url"] + "/resources/equipments/"
             api_uri += urllib.parse.quote(self.data["sender"])
             api_uri += "/measurements"
+
+            headers = {
+                'content-type': 'application/json'
+            }
+            packed = self.data_server.get("format", "json") == "msgpack"
+            if packed:
+                api_uri += "/packed"
+                headers["content-type"] = "application/msgpack"
+            compress = self.data_server.get("compress", False)
+            if compress:
+                headers["content-encoding"] = "gzip"
             self.log.info("[%s]: %s", self.name, api_uri)
 
             chunk_payload = {
@@ -217,19 +266,25 @@ class SensorsPoster(Thread):
             }
             item_idx = 0
             while item_idx < len(payload["measurements"]):
+                sent_idx = item_idx
                 chunk_data = []
                 while item_idx < len(payload["measurements"]) and \
                         len(chunk_data) < self._chunk_len:
                     chunk_data.append(payload["measurements"][item_idx])
                     item_idx += 1
                 chunk_payload["measurements"] = chunk_data
+                if packed:
+                    body = self._pack(chunk_payload)
+                else:
+                    body = json.dumps(chunk_payload).encode("utf-8")
+                if compress:
+                    body = gzip.compress(body)
+                self.bytes_sent += len(body)
                 response = requests.post(
                     api_uri,
-                    data=json.dumps(chunk_payload),
+                    data=body,
                     auth=auth,
-                    headers={
-                        'content-type': 'application/json'
-                    },
+                    headers=headers,
                     verify=verify_cert,
                     timeout=(connect_timeout, read_timeout),
                     proxies=proxies
@@ -244,6 +299,8 @@ class SensorsPoster(Thread):
                 if response.status_code != 200:
                     raise Exception(response.text)
 
+            sent_idx = item_idx
+
             self.log.info(
                 "[%s]: Message successfully forwarded "
                 "to data aggregator':",
@@ -260,3 +317,17 @@ class SensorsPoster(Thread):
                 "[%s]: Error while sendind data to data aggregator",
                 self.name
             )
+            if spool_enabled(self.data_server) and \
+                    sent_idx < len(self.data["measurements"]):
+                on_send_ok = None
+                if "func" in self._on_send_ok:
+                    on_send_ok = (
+                        self._on_send_ok["func"],
+                        self._on_send_ok["args"]
+                    )
+                # Chunks already acknowledged must not be stored twice
+                data = dict(self.data)
+                data["measurements"] = self.data["measurements"][sent_idx:]
+                get_uploader(self.data_server).spool_data(
+                    [(data, on_send_ok, None)]
+                )
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------
+# Module Name : terraHouat  power recording daemon
+# Version : 1.0
+#
+# Copyright © 2026 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# File Name   : metrics.py
+#
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Prometheus metrics endpoint
+# -------------------------------------------------------
+# History     :
+# 1.0.0 - 2026-10-18 : Release of the file
+#
+
+"""Expose daemon metrics in Prometheus text format."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import threading
+from threading import Thread
+
+from utils.uploader import UPLOADERS, UPLOADERS_LOCK
+
+PREFIX = "energyrecorder_collector_"
+
+
+def _labels(labels):
+    """Format metric labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+        )
+        for name, value in labels
+    ) + "}"
+
+
+class MetricsWriter():
+    """Build metrics page (samples are grouped by metric)."""
+
+    def __init__(self):
+        """Create an empty page."""
+        # name: (type, description, samples lines)
+        self.metrics = {}
+
+    def _samples(self, name, kind, description):
+        """Get samples lines of a metric."""
+        if name not in self.metrics:
+            self.metrics[name] = (kind, description, [])
+        return self.metrics[name][2]
+
+    def add(self, name, kind, description, value, labels=()):
+        """
+        Add a sample to page.
+
+            :param name: Metric name (without prefix)
+            :type name: string
+
+            :param kind: Metric type (counter or gauge)
+            :type kind: string
+
+            :param description: Metric help text
+            :type description: string
+
+            :param value: Sample value
+            :type value: number
+
+            :param labels: Sample labels
+            :type labels: list of (name, value)
+        """
+        self._samples(name, kind, description).append("{}{}{} {}".format(
+            PREFIX, name, _labels(labels), value
+        ))
+
+    def add_histogram(self, name, description, latency, labels=()):
+        """Add a Latency (see collector) as an histogram."""
+        samples = self._samples(name, "histogram", description)
+        labels = list(labels)
+        for bound, count in zip(latency.BUCKETS, latency.buckets):
+            samples.append("{}{}_bucket{} {}".format(
+                PREFIX, name, _labels(labels + [("le", bound)]), count
+            ))
+        samples.append("{}{}_bucket{} {}".format(
+            PREFIX, name, _labels(labels + [("le", "+Inf")]), latency.count
+        ))
+        samples.append("{}{}_sum{} {}".format(
+            PREFIX, name, _labels(labels), latency.total
+        ))
+        samples.append("{}{}_count{} {}".format(
+            PREFIX, name, _labels(labels), latency.count
+        ))
+
+    def to_bytes(self):
+        """Get page content."""
+        lines = []
+        for name, (kind, description, samples) in self.metrics.items():
+            lines.append("# HELP {}{} {}".format(PREFIX, name, description))
+            lines.append("# TYPE {}{} {}".format(PREFIX, name, kind))
+            lines += samples
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def collect_metrics(pollers):
+    """
+    Build metrics page for pollers, their collectors and uploaders.
+
+        :param pollers: Running pollers
+        :type pollers: list
+    """
+    writer = MetricsWriter()
+    writer.add(
+        "threads", "gauge", "Number of running threads",
+        threading.active_count()
+    )
+    for poller in list(pollers):
+        writer.add(
+            "collectors", "gauge", "Number of collectors by poller",
+            len(poller.conf["collectors"]),
+            [("environment", poller.conf["environment"])]
+        )
+        for collector in poller.conf["collectors"]:
+            labels = [
+                ("environment", collector.environment),
+                ("server", collector.server_id),
+                ("type", collector.type)
+            ]
+            stats = collector.stats
+            with stats.lock:
+                writer.add(
+                    "up", "gauge", "1 if collector is running",
+                    int(collector.running), labels
+                )
+                writer.add_histogram(
+                    "poll_duration_seconds",
+                    "Equipement reading duration",
+                    stats.poll_latency, labels
+                )
+                writer.add_histogram(
+                    "post_duration_seconds",
+                    "Data posting duration",
+                    stats.post_latency, labels
+                )
+                writer.add(
+                    "polls_total", "counter", "Pollings by status",
+                    stats.poll_latency.count, labels + [("status", "ok")]
+                )
+                writer.add(
+                    "polls_total", "counter", "Pollings by status",
+                    stats.errors, labels + [("status", "error")]
+                )
+                writer.add(
+                    "overruns_total", "counter",
+                    "Ticks skipped because collector was busy",
+                    stats.overruns, labels
+                )
+                writer.add(
+                    "measurements_total", "counter", "Read measurements",
+                    stats.measurements, labels
+                )
+                writer.add(
+                    "measurements_per_poll", "gauge",
+                    "Measurements read at last polling",
+                    stats.last_measurements, labels
+                )
+                writer.add(
+                    "sent_bytes_total", "counter",
+                    "Bytes sent to recording API by collector",
+                    stats.bytes_sent, labels
+                )
+
+    with UPLOADERS_LOCK:
+        uploaders = list(UPLOADERS.values())
+    for uploader in uploaders:
+        labels = [("target", uploader.data_server["base_url"])]
+        writer.add(
+            "uploader_queue_depth", "gauge", "Data pending in uploader",
+            uploader.queue.qsize(), labels
+        )
+        writer.add(
+            "uploader_sent_bytes_total", "counter",
+            "Bytes sent to recording API by uploader",
+            uploader.bytes_sent, labels
+        )
+        writer.add(
+            "uploader_batches_total", "counter", "Batches sent by status",
+            uploader.batches_sent, labels + [("status", "ok")]
+        )
+        writer.add(
+            "uploader_batches_total", "counter", "Batches sent by status",
+            uploader.errors, labels + [("status", "error")]
+        )
+        if uploader.spool is not None:
+            writer.add(
+                "spool_data", "gauge", "Data waiting in spool",
+                uploader.spool.count, labels
+            )
+            writer.add(
+                "spool_bytes", "gauge", "Spool size",
+                uploader.spool.size, labels
+            )
+    return writer.to_bytes()
+
+
+class MetricsServer(Thread):
+    """HTTP server exposing metrics on /metrics."""
+
+    def __init__(self, conf, pollers):
+        """
+        Create metrics server.
+
+            :param conf: Server settings
+            :type conf: dictionary
+            {
+                "bind": listening address,
+                "port": listening port
+            }
+
+            :param pollers: Running pollers (list updated by daemon)
+            :type pollers: list
+        """
+        Thread.__init__(self)
+        self.log = logging.getLogger(__name__)
+        self.name = "metrics"
+        self.daemon = True
+        self.conf = conf
+
+        class Handler(BaseHTTPRequestHandler):
+            """Metrics request handler."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Answer metrics page."""
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = collect_metrics(pollers)
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "text/plain; version=0.0.4"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Do not log requests."""
+
+        self.server = ThreadingHTTPServer(
+            (conf["bind"], conf["port"]),
+            Handler
+        )
+        self.server.daemon_threads = True
+
+    def run(self):
+        """Thread main code."""
+        self.log.info(
+            "Metrics available at http://%s:%d/metrics",
+            self.conf["bind"],
+            self.conf["port"]
+        )
+        self.server.serve_forever()
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------
+# Module Name : terraHouat  power recording daemon
+# Version : 1.0
+#
+# Copyright © 2026 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# File Name   : scheduler.py
+#
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Polling ticks scheduler
+# -------------------------------------------------------
+# History     :
+# 1.0.0 - 2026-10-18 : Release of the file
+# 1.1.0 - 2026-10-18 : Add per collector intervals and phase jitter
+# 1.2.0 - 2026-10-18 : Allow to wake up and reschedule a running scheduler
+#
+
+"""Drift-free polling ticks scheduler."""
+
+import heapq
+import logging
+import threading
+import time
+import zlib
+
+
+def get_phase(key, interval):
+    """
+    Get deterministic phase (in sec.) of ticks for a key.
+
+    Phase is evenly distributed in [0, interval[ and is the same for the
+    key accross restarts.
+    """
+    return zlib.crc32(key.encode("utf-8")) / 2 ** 32 * interval
+
+
+class DeadlineScheduler():
+    """
+    Compute polling ticks deadlines.
+
+    Ticks are aligned on wall clock multiples of polling interval
+    (shifted by phase) so pollers with same interval and phase tick
+    together. Deadlines are computed on monotonic clock (no drift, no
+    impact of clock changes).
+    """
+
+    # Overrun policies
+    SKIP = "skip"
+    CATCHUP = "catchup"
+
+    # Beyond this number of late ticks, catchup policy behave as skip
+    MAX_CATCHUP = 10
+
+    def __init__(self, name, interval, overrun=SKIP, phase=0):
+        """
+        Initialize scheduler.
+
+            :param name: Name of scheduler user (for logs)
+            :type name: string
+
+            :param interval: Ticks interval in sec.
+            :type interval: float
+
+            :param overrun: What to do with ticks missed because of late
+                            processing: "skip" them, or fire them
+                            immediately ("catchup")
+            :type overrun: string
+
+            :param phase: Ticks offset in sec. from interval multiples
+            :type phase: float
+        """
+        if overrun not in (self.SKIP, self.CATCHUP):
+            raise Exception(
+                "Unsupported overrun policy: {}".format(overrun)
+            )
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.interval = interval
+        self.overrun = overrun
+        self.phase = phase
+        self.deadline = None
+        self.skipped = 0
+
+    def start(self, delay=0):
+        """
+        Compute first tick deadline.
+
+            :param delay: Min. delay in sec. before first tick
+            :type delay: float
+        """
+        wall_time = time.time() + delay
+        self.deadline = time.monotonic() + delay + (
+            self.phase - wall_time
+        ) % self.interval
+
+    def advance(self):
+        """Compute next tick deadline once current tick is fired."""
+        self.deadline += self.interval
+        late = time.monotonic() - self.deadline
+        if late < 0:
+            return
+
+        missed = int(late // self.interval) + 1
+        if self.overrun == self.CATCHUP and missed <= self.MAX_CATCHUP:
+            return
+
+        self.skipped += missed
+        self.deadline += missed * self.interval
+        self.logger.warning(
+            "[%s]: Polling is late, skipping %d tick(s)",
+            self.name,
+            missed
+        )
+
+
+class PollingScheduler():
+    """Priority queue of items (collectors) ordered by next tick."""
+
+    def __init__(self, name, overrun=DeadlineScheduler.SKIP):
+        """
+        Initialize scheduler.
+
+            :param name: Name of scheduler user (for logs)
+            :type name: string
+
+            :param overrun: Items default overrun policy
+                            (see DeadlineScheduler)
+            :type overrun: string
+        """
+        self.name = name
+        self.overrun = overrun
+        self._queue = []
+        self._counter = 0
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._woken = False
+
+    def add(self, item, interval, phase=0, delay=0):
+        """
+        Add an item to schedule.
+
+            :param item: Item to schedule
+            :type item: object (with a name attribute)
+
+            :param interval: Item ticks interval in sec.
+            :type interval: float
+
+            :param phase: Item ticks offset in sec. (see DeadlineScheduler)
+            :type phase: float
+
+            :param delay: Min. delay in sec. before first tick
+            :type delay: float
+        """
+        deadline = DeadlineScheduler(
+            "{}/{}".format(self.name, item.name),
+            interval,
+            self.overrun,
+            phase
+        )
+        deadline.start(delay)
+        self._counter += 1
+        heapq.heappush(
+            self._queue,
+            (deadline.deadline, self._counter, deadline, item)
+        )
+
+    def clear(self):
+        """Remove all scheduled items."""
+        self._queue = []
+
+    def stop(self):
+        """Stop scheduler (wake up pending waits)."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def wake(self):
+        """Wake up pending waits (ex. to apply a new configuration)."""
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def stopped(self):
+        """Return True if scheduler is stopped."""
+        return self._stopped
+
+    def delay(self):
+        """Get delay in sec. until next tick (None if nothing scheduled)."""
+        if not self._queue:
+            return None
+        return max(0, self._queue[0][0] - time.monotonic())
+
+    def pop_due(self):
+        """Get items with a reached deadline and schedule their next tick."""
+        due = []
+        now = time.monotonic()
+        while self._queue and self._queue[0][0] <= now:
+            _, counter, deadline, item = heapq.heappop(self._queue)
+            deadline.advance()
+            heapq.heappush(
+                self._queue,
+                (deadline.deadline, counter, deadline, item)
+            )
+            due.append(item)
+        return due
+
+    def wait(self):
+        """
+        Wait for next tick.
+
+        Return items to trigger (may be empty if woken up before next
+        tick), or None if scheduler was stopped while waiting.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._stopped or self._woken,
+                self.delay()
+            )
+            if self._stopped:
+                return None
+            self._woken = False
+        return self.pop_due()
+
+
+def schedule_collectors(scheduler, conf, delay=0):
+    """
+    Add poller collectors to a scheduler.
+
+        :param scheduler: Poller scheduler
+        :type scheduler: PollingScheduler
+
+        :param conf: Poller configuration (collectors, polling_interval,
+                     jitter...)
+        :type conf: dictionary
+
+        :param delay: Min. delay in sec. before first tick
+        :type delay: float
+    """
+    for _collector in conf["collectors"]:
+        # Server interval, else pod interval
+        interval = _collector.polling_interval or conf["polling_interval"]
+        if interval <= 0:
+            interval = 0.1
+
+        phase = 0
+        if conf.get("jitter", False):
+            phase = get_phase(
+                "{}/{}".format(conf["environment"], _collector.server_id),
+                interval
+            )
+        scheduler.add(_collector, interval, phase, delay)
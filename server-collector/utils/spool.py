@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------
+# Module Name : terraHouat  power recording daemon
+# Version : 1.0
+#
+# Copyright © 2026 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# File Name   : spool.py
+#
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     On disk store-and-forward buffer
+# -------------------------------------------------------
+# History     :
+# 1.0.0 - 2026-10-18 : Release of the file
+# 1.1.0 - 2026-10-18 : Enforce disk quota on database files size
+#
+
+"""Crash-safe on disk queue for data recording API can't receive."""
+
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+
+class DataSpool():
+    """
+    SQLite (WAL mode) queue of collectors data.
+
+    Each daemon process uses its own database file (spool-N.db) locked
+    while in use: files of stopped (or dead) processes are reused, and
+    so replayed, by next started ones.
+
+    Spool size is the size of database pages in use (free pages of
+    deleted data are reused) plus the size of the write-ahead log.
+    """
+
+    def __init__(self, conf):
+        """
+        Open (or create) spool database.
+
+            :param conf: Spool settings
+            :type conf: dictionary
+            {
+                "directory": spool files location,
+                "max_size": disk quota in bytes, oldest data are dropped
+                            beyond
+            }
+        """
+        self.log = logging.getLogger(__name__)
+        self.conf = conf
+        self._lock = threading.Lock()
+        os.makedirs(conf["directory"], exist_ok=True)
+
+        slot = 0
+        while True:
+            path = os.path.join(conf["directory"], "spool-{}".format(slot))
+            self._lock_file = open(path + ".lock", "w")
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                self._lock_file.close()
+                slot += 1
+        self.path = path + ".db"
+
+        self._db = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS data ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "data_time INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "payload BLOB NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS data_time_idx ON data (data_time)"
+        )
+        self.count = self._db.execute(
+            "SELECT COUNT(*) FROM data"
+        ).fetchone()[0]
+        self.size = self._disk_size()
+        if self.count:
+            self.log.info(
+                "%s: %d spooled data to replay",
+                self.path,
+                self.count
+            )
+
+    def append(self, datas):
+        """
+        Store data.
+
+            :param datas: Data to store (see BaseCollector.build_data)
+            :type datas: list of dictionary
+        """
+        rows = []
+        for data in datas:
+            payload = json.dumps(data).encode("utf-8")
+            rows.append((data["data_time"], len(payload), payload))
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO data (data_time, size, payload) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+            self._db.execute("COMMIT")
+            self.count += len(rows)
+            self.size = self._disk_size()
+            self._enforce_quota()
+
+    def _disk_size(self):
+        """Get spool size on disk (in bytes)."""
+        page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+        try:
+            wal_size = os.path.getsize(self.path + "-wal")
+        except OSError:
+            wal_size = 0
+        return (page_count - free_pages) * page_size + wal_size
+
+    def _enforce_quota(self):
+        """Drop oldest data beyond disk quota."""
+        dropped = 0
+        while self.size > self.conf["max_size"] and self.count:
+            # Drop a share of data matching quota excess (at least one)
+            nb_rows = max(
+                1,
+                self.count * (self.size - self.conf["max_size"]) //
+                self.size
+            )
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "DELETE FROM data WHERE id IN ("
+                "SELECT id FROM data ORDER BY data_time, id LIMIT ?)",
+                (nb_rows,)
+            )
+            self._db.execute("COMMIT")
+            # Move deleted pages out of write-ahead log and truncate it
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.count -= nb_rows
+            dropped += nb_rows
+            self.size = self._disk_size()
+        if dropped:
+            self.log.warning(
+                "%s: spool is full, %d oldest data dropped",
+                self.path,
+                dropped
+            )
+
+    def peek(self, max_points):
+        """
+        Get oldest data (in time order).
+
+            :param max_points: Max. number of measurements to get (at
+                               least one data is returned)
+            :type max_points: int
+
+            :return: list of (id, data)
+            :rtype: list
+        """
+        result = []
+        nb_points = 0
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT id, payload FROM data ORDER BY data_time, id"
+            )
+            for row_id, payload in cursor:
+                data = json.loads(payload)
+                if result and \
+                        nb_points + len(data["measurements"]) > max_points:
+                    break
+                result.append((row_id, data))
+                nb_points += len(data["measurements"])
+            cursor.close()
+        return result
+
+    def delete(self, ids):
+        """Remove replayed data."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            for row_id in ids:
+                cursor = self._db.execute(
+                    "DELETE FROM data WHERE id = ?", (row_id,)
+                )
+                self.count -= cursor.rowcount
+            self._db.execute("COMMIT")
+            self.size = self._disk_size()
+
+    def close(self):
+        """Close database and release spool file."""
+        with self._lock:
+            self._db.close()
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
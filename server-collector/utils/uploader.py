@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------
+# Module Name : terraHouat  power recording daemon
+# Version : 1.0
+#
+# Copyright © 2026 Orange
+# This software is distributed under the Apache 2 license
+# <http://www.apache.org/licenses/LICENSE-2.0.html>
+#
+# -------------------------------------------------------
+# File Name   : uploader.py
+#
+# Created     : 2026-10
+# Authors     : Benoit HERARD <benoit.herard(at)orange.com>
+#
+# Description :
+#     Batching measurements uploader
+# -------------------------------------------------------
+# History     :
+# 1.0.0 - 2026-10-18 : Release of the file
+# 1.1.0 - 2026-10-18 : Add on disk store-and-forward spool
+# 1.2.0 - 2026-10-18 : Add counters for metrics
+# 1.3.0 - 2026-10-18 : Record collectors posting stats on acknowledgement
+#
+
+"""Long lived uploader merging collectors data in batches."""
+
+import atexit
+import gzip
+import json
+import logging
+import queue
+import threading
+from threading import Thread
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.spool import DataSpool
+
+# Uploaders by recording API base URL
+UPLOADERS = {}
+UPLOADERS_LOCK = threading.Lock()
+
+
+class Uploader(Thread):
+    """
+    Post collectors data to recording API in batches.
+
+    Data queued by collectors are merged in multi-equipements requests
+    (/resources/equipments/measurements) sent over a keep-alive
+    connections pool. A batch is sent when it reaches batch_points
+    measurements or when its oldest data is flush_interval sec. old.
+
+    When spool is enabled, data the recording API can't receive are
+    stored on disk, and replayed (in time order) with an exponential
+    backoff between failed attempts.
+    """
+
+    def __init__(self, data_server_conf):
+        """
+        Create an uploader for a recording API.
+
+            :param data_server_conf: recorder API connection params
+                (see SensorsPoster), uploader and spool settings are
+                read from its "uploader" and "spool" keys
+            :type data_server_conf: dictionary
+        """
+        Thread.__init__(self)
+        self.log = logging.getLogger(__name__)
+        self.name = "uploader/{}".format(data_server_conf["base_url"])
+        self.daemon = True
+        self.data_server = data_server_conf
+        self.conf = {
+            "enabled": False,
+            "queue_size": 1000,
+            "batch_points": 5000,
+            "flush_interval": 1,
+            "pool_size": 4
+        }
+        self.conf.update(data_server_conf.get("uploader", {}))
+        self.queue = queue.Queue(self.conf["queue_size"])
+        self.running = False
+
+        self.spool_conf = {
+            "enabled": False,
+            "directory": "/var/lib/energyrecorder/collector-spool",
+            "max_size": 100 * 1024 * 1024,
+            "min_backoff": 1,
+            "max_backoff": 300
+        }
+        self.spool_conf.update(data_server_conf.get("spool", {}))
+        self.spool = None
+        if self.spool_conf["enabled"]:
+            self.spool = DataSpool(self.spool_conf)
+        self.backoff = self.spool_conf["min_backoff"]
+        self.retry_at = 0
+
+        # Counters
+        self.bytes_sent = 0
+        self.batches_sent = 0
+        self.errors = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.conf["pool_size"]
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if data_server_conf["user"] != "" and\
+           data_server_conf["pass"] != "":
+            self.session.auth = (
+                data_server_conf["user"],
+                data_server_conf["pass"]
+            )
+        self.session.verify = data_server_conf.get("verify_cert", True)
+        if "proxy" in data_server_conf:
+            self.session.proxies = {
+                "http": data_server_conf["proxy"],
+                "https": data_server_conf["proxy"]
+            }
+        self.timeout = (10, data_server_conf.get("timeout", 300))
+
+    def submit(self, data, on_send_ok=None, stats=None):
+        """
+        Queue data to upload.
+
+            :param data: Data to post (see BaseCollector.build_data)
+            :type data: dictionary
+
+            :param on_send_ok: function and args to call once data are
+                               acknowledged by recording API
+            :type on_send_ok: tuple
+
+            :param stats: sender counters, updated while data are posted
+            :type stats: CollectorStats
+
+            :return: False if data were dropped (queue is full)
+            :rtype: bool
+        """
+        try:
+            self.queue.put_nowait((data, on_send_ok, stats))
+        except queue.Full:
+            self.log.warning(
+                "[%s]: upload queue is full, dropping data from %s",
+                self.name,
+                data["sender"]
+            )
+            return False
+        return True
+
+    def start(self):
+        """Start uploader thread."""
+        # Set before thread is scheduled, so that an early stop flushes
+        self.running = True
+        Thread.start(self)
+
+    def stop(self):
+        """Request uploader stop (queued data are sent before)."""
+        if self.running:
+            self.running = False
+            self.join()
+
+    def run(self):
+        """Thread main code."""
+        batch = []
+        nb_points = 0
+        deadline = None
+        while self.running or not self.queue.empty():
+            timeout = min(self.conf["flush_interval"], 0.5)
+            if deadline is not None:
+                timeout = min(timeout, max(0, deadline - time.monotonic()))
+            elif self._can_drain():
+                timeout = 0
+            try:
+                item = self.queue.get(timeout=timeout)
+                if not batch:
+                    deadline = time.monotonic() + self.conf["flush_interval"]
+                batch.append(item)
+                nb_points += len(item[0]["measurements"])
+            except queue.Empty:
+                pass
+
+            if batch and (
+                    nb_points >= self.conf["batch_points"] or
+                    time.monotonic() >= deadline or
+                    not self.running
+            ):
+                self._send(batch)
+                batch = []
+                nb_points = 0
+                deadline = None
+            elif not batch and self._can_drain():
+                self._drain()
+
+        if self.spool is not None:
+            self.spool.close()
+
+    def _can_drain(self):
+        """Return True if spooled data can be replayed now."""
+        return self.spool is not None and self.spool.count > 0 and \
+            time.monotonic() >= self.retry_at
+
+    def _failed(self):
+        """Delay next attempts after a send failure."""
+        self.retry_at = time.monotonic() + self.backoff
+        self.log.warning(
+            "[%s]: recording API unavailable, next attempt in %ds",
+            self.name,
+            self.backoff
+        )
+        self.backoff = min(self.backoff * 2, self.spool_conf["max_backoff"])
+
+    def _succeeded(self):
+        """Reset backoff after a successful send."""
+        self.backoff = self.spool_conf["min_backoff"]
+
+    def _drain(self):
+        """Replay a batch of spooled data."""
+        rows = self.spool.peek(self.conf["batch_points"])
+        if self._post([data for _, data in rows]):
+            self.spool.delete([row_id for row_id, _ in rows])
+            self._succeeded()
+            self.log.info(
+                "[%s]: %d spooled data replayed, %d remaining",
+                self.name,
+                len(rows),
+                self.spool.count
+            )
+        else:
+            self._failed()
+
+    def spool_data(self, datas):
+        """
+        Store data recording API can't receive in spool.
+
+            :param datas: list of (data, on_send_ok, stats), see submit
+            :type datas: list of tuple
+        """
+        self.spool.append([data for data, _, _ in datas])
+        # Data are safe on disk: equivalent to acknowledged
+        self._on_sent(datas)
+
+    def _send(self, batch):
+        """Post a batch of data and run callbacks if acknowledged."""
+        if self.spool is not None and time.monotonic() < self.retry_at:
+            # Recording API is unavailable: keep data in time order
+            self.spool_data(batch)
+            return
+
+        for _, _, stats in batch:
+            if stats is not None:
+                stats.start_post()
+        start = time.monotonic()
+        bytes_sent = self.bytes_sent
+        sent = self._post([data for data, _, _ in batch])
+        self._posted(
+            batch,
+            time.monotonic() - start,
+            self.bytes_sent - bytes_sent
+        )
+        if sent:
+            self._succeeded()
+            self._on_sent(batch)
+        elif self.spool is not None:
+            self._failed()
+            self.spool_data(batch)
+
+    @staticmethod
+    def _posted(batch, duration, nb_bytes):
+        """Update senders counters once a batch post is over."""
+        nb_points = sum(len(data["measurements"]) for data, _, _ in batch)
+        for data, _, stats in batch:
+            if stats is not None:
+                # Request size is shared according to measurements
+                stats.end_post(
+                    duration,
+                    nb_bytes * len(data["measurements"]) // max(nb_points, 1)
+                )
+
+    def _post(self, datas):
+        """
+        Post data to recording API.
+
+        Return True if data are done with (acknowledged or rejected).
+        """
+        # Each item carries its acquisition time: recording API resolves
+        # its session with it, so that replayed (old) data are attached
+        # to the session they were acquired in
+        payload = {
+            "equipements": [
+                {
+                    "equipement": data["sender"],
+                    "environment": data["environment"],
+                    "time": data["data_time"],
+                    "measurements": data["measurements"]
+                }
+                for data in datas
+            ]
+        }
+        headers = {
+            'content-type': 'application/json'
+        }
+        body = json.dumps(payload).encode("utf-8")
+        if self.data_server.get("compress", False):
+            body = gzip.compress(body)
+            headers["content-encoding"] = "gzip"
+
+        api_uri = self.data_server["base_url"]
+        api_uri += "/resources/equipments/measurements"
+        self.bytes_sent += len(body)
+        try:
+            response = self.session.post(
+                api_uri,
+                data=body,
+                headers=headers,
+                timeout=self.timeout
+            )
+            if response.status_code == 400:
+                # Rejected data: retrying would not help
+                self.errors += 1
+                self.log.error(
+                    "[%s]: %d data rejected by data aggregator: %s",
+                    self.name,
+                    len(datas),
+                    response.text
+                )
+                return True
+            if response.status_code != 200:
+                raise Exception(response.text)
+            if response.json()["status"] != "OK":
+                raise Exception(response.text)
+        except Exception:  # pylint: disable=locally-disabled,broad-except
+            self.errors += 1
+            self.log.exception(
+                "[%s]: Error while sendind %d data to data aggregator",
+                self.name,
+                len(datas)
+            )
+            return False
+
+        self.batches_sent += 1
+        self.log.debug(
+            "[%s]: %d data successfully forwarded to data aggregator",
+            self.name,
+            len(datas)
+        )
+        return True
+
+    def _on_sent(self, batch):
+        """Run callbacks of acknowledged data."""
+        for data, on_send_ok, _ in batch:
+            if on_send_ok is None:
+                continue
+            try:
+                on_send_ok[0](*on_send_ok[1])
+            except Exception:  # pylint: disable=broad-except
+                self.log.exception(
+                    "[%s]: Error while processing data sent for %s",
+                    self.name,
+                    data["sender"]
+                )
+
+
+def stop_uploaders():
+    """Stop all uploaders (queued data are sent)."""
+    with UPLOADERS_LOCK:
+        for uploader in UPLOADERS.values():
+            uploader.stop()
+        UPLOADERS.clear()
+
+
+def uploader_enabled(data_server_conf):
+    """Return True if uploader is enabled for a recording API."""
+    return data_server_conf.get("uploader", {}).get("enabled", False)
+
+
+def spool_enabled(data_server_conf):
+    """Return True if spool is enabled for a recording API."""
+    return data_server_conf.get("spool", {}).get("enabled", False)
+
+
+def get_uploader(data_server_conf):
+    """Get (and start if needed) uploader for a recording API."""
+    with UPLOADERS_LOCK:
+        uploader = UPLOADERS.get(data_server_conf["base_url"])
+        if uploader is None:
+            uploader = Uploader(data_server_conf)
+            uploader.start()
+            UPLOADERS[data_server_conf["base_url"]] = uploader
+        return uploader
+
+
+atexit.register(stop_uploaders)